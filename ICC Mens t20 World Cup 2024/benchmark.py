@@ -0,0 +1,229 @@
+"""Benchmark the dashboard sections on scaled synthetic tournaments.
+
+Synthetic matches/deliveries follow the schema and value distributions of
+this directory's CSV files, scaled to a multiple of its delivery count with
+more teams and players as the archive grows. The stats build is timed the
+way the app runs it (``get_stats`` on an empty cache, which picks the serial
+or parallel build by ``stats.PARALLEL_MIN_ROWS``) and along both paths on
+their own. Every section is timed too, split into data work and chart
+rendering, and the peak traced memory of each step is recorded. Results are written as JSON so
+runs can be compared::
+
+    python benchmark.py --scales 10 100 1000 --output benchmark.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from chart_cache import charts
+import stats
+from data_loader import DATA_DIR, DELIVERIES_DTYPES, LoadedData, load_data, share_categories
+from parallel import build_stats_parallel
+from sections import SECTIONS
+from stats import build_stats, get_stats
+
+BALLS_PER_INNINGS = 120
+PLAYERS_PER_SIDE = 11
+
+
+def _empirical(rng, series, size):
+    # Sample values with the frequencies they have in the real data
+    frequencies = series.value_counts(normalize=True)
+    return rng.choice(frequencies.index.to_numpy(), size=size, p=frequencies.to_numpy())
+
+
+def synthetic_data(scale, seed=0, template_dir=None):
+    """Return a ``LoadedData`` with about ``scale`` times the template's deliveries."""
+    # Every column, since the sampled distributions include venues
+    template = load_data(template_dir or DATA_DIR, columns=None)
+    real = template.deliveries
+    rng = np.random.default_rng(seed)
+
+    # Archives grow in matches much faster than in teams; squads rotate
+    # over the seasons, so players per team grow slowly with the size too
+    n_matches = max(1, round(len(real) * scale / (2 * BALLS_PER_INNINGS)))
+    n_teams = min(20 * max(1, int(math.sqrt(scale))), 120)
+    squad_size = int(15 * (1 + math.log10(max(scale, 1))))
+    n_venues = max(real['venue'].nunique(), int(10 * math.sqrt(scale)))
+    teams = [f'Team {i:03d}' for i in range(n_teams)]
+    players = [f'Player {i:05d}' for i in range(n_teams * squad_size)]
+    venues = [f'Venue {i:03d}' for i in range(n_venues)]
+
+    # Matches
+    team1 = rng.integers(0, n_teams, n_matches)
+    team2 = (team1 + rng.integers(1, n_teams, n_matches)) % n_teams
+    pair = np.stack([team1, team2], axis=1)
+    toss_winner = pair[np.arange(n_matches), rng.integers(0, 2, n_matches)]
+    winner = pair[np.arange(n_matches), rng.integers(0, 2, n_matches)].astype(float)
+    winner[rng.random(n_matches) < 0.02] = np.nan  # no result
+    venue = rng.integers(0, n_venues, n_matches)
+    dates = pd.Timestamp('2007-09-11') + pd.to_timedelta(np.sort(rng.integers(0, 365 * 18, n_matches)), unit='D')
+    team_dtype = pd.CategoricalDtype(teams)
+    matches = pd.DataFrame({
+        'season': pd.Categorical(dates.year.astype(str)),
+        'team1': pd.Categorical.from_codes(team1, dtype=team_dtype),
+        'team2': pd.Categorical.from_codes(team2, dtype=team_dtype),
+        'date': dates,
+        'match_number': np.arange(1, n_matches + 1) % 32768,
+        'venue': pd.Categorical.from_codes(venue, categories=venues),
+        'toss_winner': pd.Categorical.from_codes(toss_winner, dtype=team_dtype),
+        'toss_decision': pd.Categorical(rng.choice(['bat', 'field'], n_matches)),
+        'winner': pd.Categorical.from_codes(np.nan_to_num(winner, nan=-1).astype(int), dtype=team_dtype),
+    }).astype({'match_number': 'int16'})
+
+    # Deliveries: two innings of 120 balls per match
+    n_innings = 2 * n_matches
+    rows = n_innings * BALLS_PER_INNINGS
+    innings_index = np.repeat(np.arange(n_innings), BALLS_PER_INNINGS)
+    match_index = innings_index // 2
+    innings = innings_index % 2
+    ball_index = np.tile(np.arange(BALLS_PER_INNINGS), n_innings)
+    over, ball_in_over = np.divmod(ball_index, 6)
+    batting = np.where(innings == 0, team1[match_index], team2[match_index])
+    bowling = np.where(innings == 0, team2[match_index], team1[match_index])
+
+    runs = _empirical(rng, real['runs_off_bat'], rows).astype('int8')
+    extras = _empirical(rng, real['extras'], rows).astype('int8')
+    wicket = rng.random(rows) < real['wicket_type'].notna().mean()
+    wicket_types = real['wicket_type'].dropna()
+    wicket_type = np.where(wicket, _empirical(rng, wicket_types.astype(str), rows), None)
+
+    # Batters come in as wickets fall; the strike alternates every over
+    wickets_before = np.cumsum(wicket) - wicket
+    wickets_before -= np.repeat(wickets_before[::BALLS_PER_INNINGS], BALLS_PER_INNINGS)
+    slot = np.minimum(wickets_before, PLAYERS_PER_SIDE - 2)
+    squad_offset = rng.integers(0, squad_size, n_innings)[innings_index]
+    striker_slot = slot + over % 2
+    non_striker_slot = slot + 1 - over % 2
+    bowler_slot = PLAYERS_PER_SIDE - 1 - over % 5
+
+    def player(team, slot):
+        return team * squad_size + (squad_offset + slot) % squad_size
+
+    player_dtype = pd.CategoricalDtype(players)
+    striker = pd.Categorical.from_codes(player(batting, striker_slot), dtype=player_dtype)
+    deliveries = pd.DataFrame({
+        'match_id': match_index + 1,
+        'season': matches['season'].to_numpy()[match_index],
+        'start_date': matches['date'].to_numpy()[match_index],
+        'venue': matches['venue'].to_numpy()[match_index],
+        'innings': innings + 1,
+        'ball': over + (ball_in_over + 1) / 10,
+        'batting_team': pd.Categorical.from_codes(batting, dtype=team_dtype),
+        'bowling_team': pd.Categorical.from_codes(bowling, dtype=team_dtype),
+        'striker': striker,
+        'non_striker': pd.Categorical.from_codes(player(batting, non_striker_slot), dtype=player_dtype),
+        'bowler': pd.Categorical.from_codes(player(bowling, bowler_slot), dtype=player_dtype),
+        'runs_off_bat': runs,
+        'extras': extras,
+        'wicket_type': pd.Categorical(wicket_type),
+        'player_dismissed': pd.Series(striker).where(wicket),
+    })
+    dtypes = {column: dtype for column, dtype in DELIVERIES_DTYPES.items()
+              if column in deliveries and dtype != 'category'}
+    deliveries = deliveries.astype(dtypes)
+    share_categories(deliveries, ['striker', 'non_striker', 'bowler', 'player_dismissed'])
+
+    return LoadedData(matches, deliveries, ('synthetic', scale, seed), 0.0,
+                      data_dir=f'synthetic-{scale}x', overs=20)
+
+
+def _measure(func, memory):
+    """Run ``func`` and return (wall seconds, render seconds, peak MB)."""
+    charts.clear()
+    render_before = charts.render_seconds
+    start = time.perf_counter()
+    func()
+    wall = time.perf_counter() - start
+    render = charts.render_seconds - render_before
+
+    peak = None
+    if memory:
+        # A second, traced run: tracing slows allocation-heavy code, so it
+        # is kept out of the timings
+        charts.clear()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return wall, render, peak
+
+
+def run_scale(scale, seed=0, memory=True):
+    start = time.perf_counter()
+    data = synthetic_data(scale, seed)
+    generate = time.perf_counter() - start
+    results = []
+
+    def record(step, wall, render, peak):
+        results.append({
+            'scale': scale,
+            'rows': len(data.deliveries),
+            'step': step,
+            'data_seconds': round(wall - render, 6),
+            'render_seconds': round(render, 6),
+            'peak_mb': None if peak is None else round(peak, 3),
+        })
+        print(f'{scale:>6}x {step:<14} data {wall - render:8.3f}s  render {render:7.3f}s'
+              + ('' if peak is None else f'  peak {peak:9.1f} MB'))
+
+    record('generate', generate, 0.0, None)
+
+    def fresh_stats():
+        stats.clear_cache()
+        get_stats(data)
+
+    record('stats', *_measure(fresh_stats, memory))
+    record('stats_serial', *_measure(lambda: build_stats(data.deliveries, data.overs), memory))
+    record('stats_parallel', *_measure(lambda: build_stats_parallel(data.deliveries, data.overs), memory))
+    get_stats(data)  # sections read the cached tables, as they do in the app
+    for key, section in SECTIONS.items():
+        record(key, *_measure(lambda: section.render(data), memory))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard sections on synthetic data.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100, 1000],
+                        help='multiples of the real deliveries.csv size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the traced run that records peak memory')
+    parser.add_argument('--output', default='benchmark.json', help='JSON file the results are written to')
+    args = parser.parse_args()
+
+    # Sections call Streamlit outside a running app, and the plotting
+    # libraries' deprecation notices repeat on every section; both are noise here
+    logging.disable(logging.WARNING)
+    warnings.simplefilter('ignore')
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(scale, args.seed, args.memory))
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
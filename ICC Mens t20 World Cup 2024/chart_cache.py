@@ -0,0 +1,91 @@
+import io
+import threading
+import time
+from collections import OrderedDict
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+# Rendered images kept per process before the least recently used are dropped
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# pyplot keeps the current figure and its figure registry per process, not
+# per thread, so sessions draw and save one figure at a time
+_render_lock = threading.Lock()
+
+
+class ChartCache:
+    """LRU cache of rendered chart images bounded by their total size in bytes.
+
+    ``render`` draws a figure only when its key is not cached, saves it as
+    PNG or SVG and always closes the figure, so matplotlib memory does not
+    grow with the number of sessions or reruns.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # Total time spent drawing and saving figures on misses
+        self.render_seconds = 0.0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def render(self, key, draw, fmt='png', dpi=100):
+        """Return the image bytes for ``key``, calling ``draw()`` on a miss.
+
+        ``key`` should identify the data version and every parameter the
+        chart depends on. ``draw`` returns a matplotlib figure.
+        """
+        cache_key = (key, fmt, dpi)
+        with self._lock:
+            image = self._images.get(cache_key)
+            if image is not None:
+                self._images.move_to_end(cache_key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        # Render outside the cache lock, so hits are served while a figure
+        # is being drawn
+        with _render_lock:
+            with self._lock:
+                # Another session may have rendered it while this one waited
+                image = self._images.get(cache_key)
+            if image is not None:
+                return image
+            start = time.perf_counter()
+            fig = draw()
+            try:
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+            finally:
+                plt.close(fig)
+            image = buffer.getvalue()
+
+            with self._lock:
+                self.render_seconds += time.perf_counter() - start
+                self._images[cache_key] = image
+                self.size += len(image)
+                self._evict()
+        return image
+
+    def _evict(self):
+        while self.size > self.max_bytes and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self.size -= len(image)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.size = 0
+
+
+# Shared by every session of the app
+charts = ChartCache()
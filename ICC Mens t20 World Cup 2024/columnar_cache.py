@@ -0,0 +1,167 @@
+"""Typed columnar copies of the project CSV files.
+
+Each ``name.csv`` gets a ``name.feather`` (or ``name.parquet``) written next
+to it. Readers ask for the columns they need; the columnar copy is used when
+it was written from the current version of the CSV and the CSV is parsed
+otherwise. Feather files are written uncompressed so they can be memory
+mapped: only the requested columns are paged in and nothing is
+decompressed, though converting them to pandas still copies them.
+
+Convert every CSV in the repository with::
+
+    python columnar_cache.py            # Feather copies
+    python columnar_cache.py --parquet  # Parquet copies
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # the CSV files are always usable without pyarrow
+    pa = None
+
+FORMATS = ['feather', 'parquet']
+# Schema metadata key holding the (mtime_ns, size) of the source CSV
+SOURCE_KEY = b'csv_version'
+# Text columns with at most this share of distinct values become categories
+CATEGORY_RATIO = 0.5
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def available():
+    return pa is not None
+
+
+def csv_version(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def cache_path(csv_path, fmt='feather'):
+    return os.path.splitext(csv_path)[0] + '.' + fmt
+
+
+def optimize_dtypes(df):
+    """Downcast integer columns and turn repetitive text columns into categories."""
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_integer_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype == object or pd.api.types.is_string_dtype(values):
+            if values.nunique() <= CATEGORY_RATIO * len(values):
+                df[column] = values.astype('category')
+    return df
+
+
+def _source_version(schema):
+    metadata = schema.metadata or {}
+    if SOURCE_KEY not in metadata:
+        return None
+    return json.loads(metadata[SOURCE_KEY])
+
+
+def write_cache(csv_path, df=None, fmt='feather'):
+    """Write the columnar copy of ``csv_path`` and return its path.
+
+    ``df`` is the already typed frame to store; by default the CSV is parsed
+    and passed through ``optimize_dtypes``.
+    """
+    if not available():
+        raise RuntimeError('pyarrow is required to write columnar caches')
+    version = csv_version(csv_path)
+    if df is None:
+        df = optimize_dtypes(pd.read_csv(csv_path))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_KEY] = json.dumps(version).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = cache_path(csv_path, fmt)
+    tmp_path = path + '.tmp'
+    if fmt == 'feather':
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+    else:
+        pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def fresh_cache(csv_path):
+    """Return the path of an up-to-date columnar copy of ``csv_path``, or None."""
+    if not available():
+        return None
+    version = csv_version(csv_path)
+    for fmt in FORMATS:
+        path = cache_path(csv_path, fmt)
+        if not os.path.exists(path):
+            continue
+        try:
+            if fmt == 'feather':
+                schema = feather.read_table(path, columns=[], memory_map=True).schema
+            else:
+                schema = pq.read_schema(path)
+        except (OSError, pa.ArrowInvalid):
+            continue
+        if _source_version(schema) == version:
+            return path
+    return None
+
+
+def read_columns(csv_path, columns=None, memory_map=True, **read_csv_kwargs):
+    """Read ``columns`` of ``csv_path``, from its columnar copy when fresh.
+
+    ``read_csv_kwargs`` are passed to ``pd.read_csv`` when the CSV has to
+    be parsed instead.
+    """
+    path = fresh_cache(csv_path)
+    if path is None:
+        if columns is not None:
+            read_csv_kwargs['usecols'] = columns
+        return pd.read_csv(csv_path, **read_csv_kwargs)
+    if path.endswith('.feather'):
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def find_csvs(root):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+        for filename in sorted(filenames):
+            if filename.endswith('.csv'):
+                yield os.path.join(directory, filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write typed columnar copies of CSV files.')
+    parser.add_argument('root', nargs='?', default=REPO_ROOT, help='directory searched for CSV files')
+    parser.add_argument('--parquet', action='store_true', help='write Parquet instead of Feather')
+    parser.add_argument('--force', action='store_true', help='rewrite copies that are still fresh')
+    args = parser.parse_args()
+
+    # The app's own files are stored with the dtypes data_loader parses them
+    # with; every other CSV gets optimize_dtypes
+    from data_loader import typed_readers
+    readers = typed_readers()
+
+    fmt = 'parquet' if args.parquet else 'feather'
+    for csv_path in find_csvs(os.path.abspath(args.root)):
+        if not args.force and fresh_cache(csv_path) == cache_path(csv_path, fmt):
+            print(f'fresh    {csv_path}')
+            continue
+        reader = readers.get(csv_path)
+        df = reader(csv_path) if reader is not None else None
+        path = write_cache(csv_path, df, fmt=fmt)
+        print(f'wrote    {path} ({os.path.getsize(path) / 1e6:.1f} MB, '
+              f'csv {os.path.getsize(csv_path) / 1e6:.1f} MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from columnar_cache import read_columns
+
+# Directory that holds matches.csv and deliveries.csv
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Explicit dtypes so the CSVs are parsed once into compact columns
+MATCHES_DTYPES = {
+    'season': 'category',
+    'team1': 'category',
+    'team2': 'category',
+    'match_number': 'int16',
+    'venue': 'category',
+    'city': 'category',
+    'toss_winner': 'category',
+    'toss_decision': 'category',
+    'player_of_match': 'category',
+    'umpire1': 'category',
+    'umpire2': 'category',
+    'reserve_umpire': 'category',
+    'match_referee': 'category',
+    'winner': 'category',
+    'winner_runs': 'Int16',
+    'winner_wickets': 'Int8',
+    'match_type': 'category',
+}
+MATCHES_DATES = ['date']
+
+DELIVERIES_DTYPES = {
+    'match_id': 'int32',
+    'season': 'category',
+    'venue': 'category',
+    'innings': 'int8',
+    'ball': 'float64',
+    'batting_team': 'category',
+    'bowling_team': 'category',
+    'striker': 'category',
+    'non_striker': 'category',
+    'bowler': 'category',
+    'runs_off_bat': 'int8',
+    'extras': 'int8',
+    'wides': 'Int8',
+    'noballs': 'Int8',
+    'byes': 'Int8',
+    'legbyes': 'Int8',
+    'penalty': 'Int8',
+    'wicket_type': 'category',
+    'player_dismissed': 'category',
+    'other_wicket_type': 'category',
+    'other_player_dismissed': 'category',
+}
+DELIVERIES_DATES = ['start_date']
+
+# Deliveries columns the dashboard reads (through stats.py, derived.py and
+# query.py); load_data reads only these unless asked for more
+DASHBOARD_COLUMNS = ['match_id', 'ball', 'batting_team', 'striker', 'non_striker', 'bowler',
+                     'runs_off_bat', 'extras', 'wicket_type']
+
+
+@dataclass(frozen=True)
+class LoadedData:
+    """Parsed matches/deliveries frames plus how long they took to load."""
+    matches: pd.DataFrame
+    deliveries: pd.DataFrame
+    version: tuple
+    load_seconds: float
+    data_dir: str = DATA_DIR
+    # Overs per innings: 20 for T20, 50 for ODI
+    overs: int = 20
+
+    @property
+    def memory_bytes(self):
+        return (int(self.matches.memory_usage(deep=True).sum())
+                + int(self.deliveries.memory_usage(deep=True).sum()))
+
+
+# Process-wide cache shared by every Streamlit session: {(data_dir, columns): LoadedData}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def file_version(path):
+    """Cheap fingerprint of a file; changes whenever the file is rewritten."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Columns that hold the same kind of name share one category set, so they
+# can be compared with each other (e.g. toss_winner == winner)
+MATCHES_SHARED = [['team1', 'team2', 'toss_winner', 'winner']]
+DELIVERIES_SHARED = [
+    ['batting_team', 'bowling_team'],
+    ['striker', 'non_striker', 'bowler', 'player_dismissed', 'other_player_dismissed'],
+]
+
+
+def share_categories(df, columns):
+    names = set()
+    for column in columns:
+        names.update(df[column].cat.categories)
+    dtype = pd.CategoricalDtype(sorted(names))
+    for column in columns:
+        df[column] = df[column].astype(dtype)
+    return df
+
+
+def _read(path, dtypes, dates, shared, columns=None):
+    if isinstance(path, (str, os.PathLike)):
+        # Prefer the columnar copy written by columnar_cache.py when it is fresh
+        parse_dates = [date for date in dates if columns is None or date in columns]
+        df = read_columns(path, columns, dtype=dtypes, parse_dates=parse_dates)
+    else:
+        df = pd.read_csv(path, dtype=dtypes, parse_dates=dates)
+
+    # A generic columnar copy may not carry these exact dtypes yet
+    df = df.astype({column: dtype for column, dtype in dtypes.items()
+                    if column in df and df[column].dtype != dtype})
+    for date in dates:
+        if date in df and not pd.api.types.is_datetime64_any_dtype(df[date]):
+            df[date] = pd.to_datetime(df[date].astype(str))
+    for group in shared:
+        present = [column for column in group if column in df]
+        if present:
+            share_categories(df, present)
+    return df
+
+
+def read_matches(path, columns=None):
+    return _read(path, MATCHES_DTYPES, MATCHES_DATES, MATCHES_SHARED, columns)
+
+
+def read_deliveries(path, columns=None):
+    return _read(path, DELIVERIES_DTYPES, DELIVERIES_DATES, DELIVERIES_SHARED, columns)
+
+
+def typed_readers(data_dir=DATA_DIR):
+    """Map each CSV this module knows the dtypes of to its reader."""
+    return {
+        os.path.join(data_dir, 'matches.csv'): read_matches,
+        os.path.join(data_dir, 'deliveries.csv'): read_deliveries,
+    }
+
+
+def load_data(data_dir=DATA_DIR, overs=20, columns=DASHBOARD_COLUMNS):
+    """Return the shared, read-only matches/deliveries for ``data_dir``.
+
+    Only the deliveries ``columns`` are read, by default those the dashboard
+    needs; ``columns=None`` reads them all. The CSVs are parsed once per
+    process and re-parsed only when the mtime or size of either file
+    changes. Callers must copy a frame before adding columns to it.
+    """
+    matches_path = os.path.join(data_dir, 'matches.csv')
+    deliveries_path = os.path.join(data_dir, 'deliveries.csv')
+    version = (file_version(matches_path), file_version(deliveries_path))
+    key = (data_dir, None if columns is None else tuple(columns))
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached.version == version and cached.overs == overs:
+            return cached
+
+        start = time.perf_counter()
+        matches = read_matches(matches_path)
+        deliveries = read_deliveries(deliveries_path, None if columns is None else list(columns))
+        loaded = LoadedData(matches, deliveries, version, time.perf_counter() - start,
+                            data_dir, overs)
+        _cache[key] = loaded
+        return loaded
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,142 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DASHBOARD_COLUMNS, DATA_DIR, DELIVERIES_SHARED, MATCHES_SHARED, load_data
+from derived import PHASE_STARTS, PHASES
+from stats import get_stats
+
+REPO_ROOT = os.path.dirname(DATA_DIR)
+
+
+@dataclass(frozen=True)
+class Tournament:
+    """A directory holding a Cricsheet-style matches.csv/deliveries.csv pair."""
+    key: str
+    name: str
+    data_dir: str
+    # Overs per innings: 20 for T20, 50 for ODI
+    overs: int = 20
+
+    @property
+    def available(self):
+        return all(os.path.exists(os.path.join(self.data_dir, name))
+                   for name in ['matches.csv', 'deliveries.csv'])
+
+    def load(self, columns=DASHBOARD_COLUMNS):
+        return load_data(self.data_dir, self.overs, columns)
+
+
+# Known tournaments in display order: {key: Tournament}
+TOURNAMENTS = {}
+
+
+def register_tournament(key, name, data_dir, overs=20, phase_starts=None):
+    """Register a tournament of ``overs``-over innings.
+
+    Formats other than T20 and ODI need ``phase_starts``: the first over
+    (0-based) of each of ``derived.PHASES``, e.g. ``[0, 2, 8]`` for T10.
+    """
+    if phase_starts is not None:
+        phase_starts = list(phase_starts)
+        if (len(phase_starts) != len(PHASES) or phase_starts[0] != 0
+                or phase_starts != sorted(set(phase_starts)) or phase_starts[-1] >= overs):
+            raise ValueError(f'phase_starts must be {len(PHASES)} increasing overs from 0 '
+                             f'below {overs}, got {phase_starts}')
+        if PHASE_STARTS.get(overs, phase_starts) != phase_starts:
+            raise ValueError(f'{overs}-over innings already have phases starting at {PHASE_STARTS[overs]}')
+        PHASE_STARTS[overs] = phase_starts
+    if overs not in PHASE_STARTS:
+        raise ValueError(f'no innings phases known for {overs}-over matches; pass phase_starts')
+    TOURNAMENTS[key] = Tournament(key, name, data_dir, overs)
+    return TOURNAMENTS[key]
+
+
+register_tournament('t20-wc-2024', "ICC Men's T20 World Cup 2024", DATA_DIR)
+register_tournament('odi-wc-2023', "ICC Men's Cricket World Cup 2023",
+                    os.path.join(REPO_ROOT, 'WorldCup2023 Project'), overs=50)
+
+
+def available_tournaments():
+    """Registered tournaments whose files are present (a deployment may ship only one)."""
+    return [tournament for tournament in TOURNAMENTS.values() if tournament.available]
+
+
+def _shared_dtypes(frames, groups):
+    # One category dictionary per group of name columns across all frames,
+    # so concatenating keeps them categorical instead of falling back to text
+    dtypes = {}
+    for group in groups:
+        names = set()
+        for df in frames:
+            for column in group:
+                names.update(df[column].cat.categories)
+        dtype = pd.CategoricalDtype(sorted(names))
+        dtypes.update(dict.fromkeys(group, dtype))
+    return dtypes
+
+
+def _concat(frames, keys, groups):
+    dtypes = _shared_dtypes(frames, groups)
+    # Columns such as season or venue are categorical per event too
+    for column in frames[0].columns:
+        if column not in dtypes and all(isinstance(df[column].dtype, pd.CategoricalDtype) for df in frames):
+            dtypes.update(_shared_dtypes(frames, [[column]]))
+    combined = pd.concat([df.astype(dtypes) for df in frames], ignore_index=True)
+    codes = np.repeat(np.arange(len(frames), dtype='int8'), [len(df) for df in frames])
+    tournament = pd.Categorical.from_codes(codes, categories=keys)
+    combined.insert(0, 'tournament', tournament)
+    return combined
+
+
+@dataclass(frozen=True)
+class Archive:
+    """Matches and deliveries of several tournaments in one pair of frames.
+
+    Team and player columns share one category dictionary across all events,
+    so each row stores small integer codes instead of repeating names.
+    Matches are identified by (tournament, match_id).
+    """
+    keys: list
+    matches: pd.DataFrame
+    deliveries: pd.DataFrame
+
+
+def load_archive(keys=None):
+    tournaments = [TOURNAMENTS[key] for key in keys] if keys else available_tournaments()
+    # Every deliveries column, not just the ones the dashboard reads
+    loaded = [tournament.load(columns=None) for tournament in tournaments]
+    keys = [tournament.key for tournament in tournaments]
+    return Archive(
+        keys,
+        _concat([data.matches for data in loaded], keys, MATCHES_SHARED),
+        _concat([data.deliveries for data in loaded], keys, DELIVERIES_SHARED),
+    )
+
+
+def _stack(keys, table):
+    frames = {key: getattr(get_stats(TOURNAMENTS[key].load()), table) for key in keys}
+    return pd.concat(frames, names=['tournament'])
+
+
+def player_totals(keys=None, player=None, by_tournament=False):
+    """Batting and bowling totals of every player across ``keys``.
+
+    Each tournament's totals come from its cached ``stats`` tables, so this
+    never rescans the deliveries. With ``by_tournament`` the rows are kept
+    per event; ``player`` narrows the result to one name, and to no rows
+    when that player did not play in any of ``keys``.
+    """
+    keys = keys or [tournament.key for tournament in available_tournaments()]
+    batting = _stack(keys, 'batters')[['balls', 'runs', 'dots', 'fours', 'sixes']]
+    bowling = _stack(keys, 'bowlers')[['balls', 'conceded', 'wickets']]
+    batting.index.names = bowling.index.names = ['tournament', 'player']
+    totals = batting.join(bowling, how='outer', lsuffix='_faced', rsuffix='_bowled')
+    totals = totals.fillna(0).astype('int64')
+    if not by_tournament:
+        totals = totals.groupby(level='player').sum()
+    if player is not None:
+        totals = totals[totals.index.get_level_values('player') == player]
+    return totals
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Phases of an innings and the first over (0-based) of each one, by the
+# number of overs in an innings (T20 or ODI)
+PHASES = ['Powerplay', 'Middle Overs', 'Death Overs']
+PHASE_STARTS = {20: [0, 7, 16], 50: [0, 10, 40]}
+PHASE_DTYPE = pd.CategoricalDtype(PHASES, ordered=True)
+
+# Deliveries faced by a team before the batting order switches from
+# 'Opening' to 'Middle Order' (section 3.7)
+OPENING_BALLS = 24
+BATTING_ORDERS = ['Opening', 'Middle Order']
+BATTING_ORDER_DTYPE = pd.CategoricalDtype(BATTING_ORDERS, ordered=True)
+
+# A team's innings, used to number the balls it has faced (section 3.2)
+INNINGS_KEYS = ['match_id', 'batting_team']
+
+
+def group_positions(codes):
+    """1-based running count of each row within its group, like ``cumcount() + 1``."""
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    rows = np.arange(len(codes))
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    group_start = np.maximum.accumulate(np.where(starts, rows, 0))
+    positions = np.empty(len(codes), dtype='int64')
+    positions[order] = rows - group_start + 1
+    return positions
+
+
+def innings_positions(deliveries):
+    """Running ball count of each delivery within its team's innings."""
+    match_codes, _ = pd.factorize(deliveries['match_id'])
+    team_codes, teams = pd.factorize(deliveries['batting_team'])
+    return group_positions(match_codes.astype('int64') * max(len(teams), 1) + team_codes)
+
+
+def derive_columns(deliveries, positions=None, overs=20):
+    """Compute the helper columns used by the analyses in one vectorized pass.
+
+    Returns a frame with the same index as ``deliveries`` holding the integer
+    over and ball-in-over, the innings phase, dot and boundary flags, the
+    ball's position in its team's innings and the batting order. Pass
+    ``positions`` to continue the innings counts of an earlier batch and
+    ``overs`` to pick the phase boundaries of the format.
+    """
+    ball = deliveries['ball'].to_numpy(dtype='float64')
+    over = np.floor(ball).astype('int8')
+    ball_in_over = np.rint((ball - over) * 10).astype('int8')
+    runs = deliveries['runs_off_bat'].to_numpy()
+    if positions is None:
+        positions = innings_positions(deliveries)
+
+    phase_codes = np.searchsorted(PHASE_STARTS[overs], over, side='right') - 1
+    order_codes = (positions > OPENING_BALLS).astype('int8')
+    return pd.DataFrame({
+        'over': over,
+        'ball_in_over': ball_in_over,
+        'phase': pd.Categorical.from_codes(phase_codes, dtype=PHASE_DTYPE),
+        'is_dot': (runs == 0).astype('int8'),
+        'is_boundary': ((runs == 4) | (runs == 6)).astype('int8'),
+        'ball_number': positions.astype('int16'),
+        'batting_order': pd.Categorical.from_codes(order_codes, dtype=BATTING_ORDER_DTYPE),
+    }, index=deliveries.index)
+
+
+def with_derived_columns(deliveries, overs=20):
+    """Return a copy of ``deliveries`` with the derived columns appended."""
+    return pd.concat([deliveries, derive_columns(deliveries, overs=overs)], axis=1)
@@ -0,0 +1,287 @@
+"""Opt-in timing and memory instrumentation of the dashboard sections.
+
+Off by default. Set ``DASHBOARD_DIAGNOSTICS=1`` (or open the app with
+``?diagnostics=1``) to measure every section that is shown. Each section is
+split into a data step (everything but chart drawing) and a render step
+(``sections.show_chart``), with wall time, CPU time, rows read and the net
+allocation of each. The numbers appear in a collapsible panel under the
+section, are logged as one JSON line per section on the
+``dashboard.metrics`` logger, and are summed per section in Prometheus text
+format on ``http://localhost:$DASHBOARD_METRICS_PORT/metrics`` when that
+variable is set. ``DASHBOARD_PROFILE=1`` (or ``?profile=1``) also runs the
+section under cProfile; ``DASHBOARD_PROFILE_DIR`` keeps the raw profiles for
+snakeviz or pstats.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+logger = logging.getLogger('dashboard.metrics')
+
+STEPS = ['data', 'render']
+# Functions listed in a section's profile, by cumulative time
+PROFILE_LINES = 25
+# StepMetrics fields exported as gauges instead of counters
+GAUGES = {'alloc_bytes'}
+
+
+def _flag(name, query_params=None, param=None):
+    if query_params is not None and query_params.get(param) in ('1', 'true'):
+        return True
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def enabled(query_params=None):
+    return _flag('DASHBOARD_DIAGNOSTICS', query_params, 'diagnostics')
+
+
+def profiling(query_params=None):
+    return _flag('DASHBOARD_PROFILE', query_params, 'profile')
+
+
+@dataclass
+class StepMetrics:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: int = 0
+    alloc_bytes: int = 0
+
+    def add(self, other, sign=1):
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + sign * getattr(other, f.name))
+
+
+@dataclass
+class SectionRun:
+    """Measurements of one render of one section."""
+    section: str
+    data_version: str
+    steps: dict = field(default_factory=lambda: {step: StepMetrics() for step in STEPS})
+    peak_bytes: int = 0
+    profile: str = ''
+
+    def to_dict(self):
+        record = asdict(self)
+        record.pop('profile')
+        return record
+
+
+class _Counted:
+    """Read-only view of ``data`` or a stats object that counts the rows of the frames read through it.
+
+    Each frame counts once per section, however often it is read.
+    """
+
+    def __init__(self, obj, seen):
+        self._obj = obj
+        self._seen = seen
+
+    def __getattr__(self, name):
+        value = getattr(self._obj, name)
+        if isinstance(value, pd.DataFrame):
+            self._seen[id(value)] = len(value)
+        return value
+
+    def track(self, obj):
+        # Used by stats.get_stats so reads of the stats tables count too
+        return _Counted(obj, self._seen)
+
+
+# The section being measured on each thread; Streamlit runs each session's
+# script on its own thread
+_local = threading.local()
+
+
+def _measure_into(metrics):
+    wall, cpu = time.perf_counter(), time.thread_time()
+    allocated = tracemalloc.get_traced_memory()[0]
+    rows = sum(_local.seen.values())
+
+    def finish():
+        metrics.wall_seconds += time.perf_counter() - wall
+        metrics.cpu_seconds += time.thread_time() - cpu
+        metrics.alloc_bytes += tracemalloc.get_traced_memory()[0] - allocated
+        metrics.rows += sum(_local.seen.values()) - rows
+    return finish
+
+
+@contextmanager
+def render_step():
+    """Attribute the enclosed chart rendering to the render step of the current section."""
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield
+        return
+    finish = _measure_into(run.steps['render'])
+    try:
+        yield
+    finally:
+        finish()
+
+
+# tracemalloc is process-wide while sessions run on their own threads, so
+# it is started by the first section measured and stopped after the last
+_tracers = 0
+_started_tracing = False
+_tracers_lock = threading.Lock()
+
+
+@contextmanager
+def _tracing():
+    global _tracers, _started_tracing
+    with _tracers_lock:
+        if _tracers == 0:
+            # Leave alone a trace someone else started (e.g. the benchmark)
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            # The peak is shared too: only reset it when no other section is
+            # being measured, so overlapping sections see the peak of all of them
+            tracemalloc.reset_peak()
+        _tracers += 1
+    try:
+        yield
+    finally:
+        with _tracers_lock:
+            _tracers -= 1
+            if _tracers == 0 and _started_tracing:
+                tracemalloc.stop()
+
+
+def measure(section, data, profile=False):
+    """Render ``section`` for ``data`` and return its ``SectionRun``."""
+    run = SectionRun(section.key, str(data.version))
+    total = StepMetrics()
+    profiler = cProfile.Profile() if profile else None
+    with _tracing():
+        _local.run, _local.seen = run, {}
+        finish = _measure_into(total)
+        try:
+            if profiler:
+                profiler.runcall(section.render, _Counted(data, _local.seen))
+            else:
+                section.render(_Counted(data, _local.seen))
+        finally:
+            finish()
+            run.peak_bytes = tracemalloc.get_traced_memory()[1]
+            _local.run = _local.seen = None
+
+    # The data step is whatever the section did outside chart rendering
+    total.add(run.steps['render'], sign=-1)
+    run.steps['data'] = total
+    if profiler:
+        run.profile = _profile_report(profiler, section.key)
+    _record(run)
+    return run
+
+
+def _profile_report(profiler, key):
+    directory = os.environ.get('DASHBOARD_PROFILE_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(directory, f'section-{key}-{time.time_ns()}.prof'))
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+
+# Running totals per (section, step) since the process started, served on
+# the metrics endpoint
+_totals = {}
+_runs = {}
+_totals_lock = threading.Lock()
+
+
+def _record(run):
+    with _totals_lock:
+        _runs[run.section] = _runs.get(run.section, 0) + 1
+        for step, metrics in run.steps.items():
+            _totals.setdefault((run.section, step), StepMetrics()).add(metrics)
+    logger.info(json.dumps(run.to_dict()))
+
+
+def metrics_text():
+    """Totals of every measured section in the Prometheus text format."""
+    lines = ['# TYPE dashboard_section_runs_total counter']
+    with _totals_lock:
+        lines += [f'dashboard_section_runs_total{{section="{section}"}} {count}'
+                  for section, count in sorted(_runs.items())]
+        for name in [f.name for f in fields(StepMetrics)]:
+            # Net allocations can be negative (a step may free more than it
+            # allocates), so their sum is a gauge rather than a counter
+            if name in GAUGES:
+                metric, kind = f'dashboard_section_{name}', 'gauge'
+            else:
+                metric, kind = f'dashboard_section_{name}_total', 'counter'
+            lines.append(f'# TYPE {metric} {kind}')
+            lines += [f'{metric}{{section="{section}",step="{step}"}} {getattr(metrics, name)}'
+                      for (section, step), metrics in sorted(_totals.items())]
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the app's log
+        pass
+
+
+_server = None
+# Set when the endpoint could not be started, so reruns do not retry it
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None):
+    """Serve ``metrics_text()`` on ``port`` (default ``$DASHBOARD_METRICS_PORT``), once per process.
+
+    Returns None when no port is set or it cannot be bound (for example by
+    a second app process on the same host); the diagnostics panel and the
+    JSON log lines work without the endpoint.
+    """
+    global _server, _server_failed
+    port = port or os.environ.get('DASHBOARD_METRICS_PORT')
+    with _server_lock:
+        if _server is None and port and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer(('127.0.0.1', int(port)), _MetricsHandler)
+            except OSError as error:
+                _server_failed = True
+                logger.warning('metrics endpoint not started on port %s: %s', port, error)
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+def diagnostics_panel(run):
+    """Show ``run`` in a collapsed Streamlit expander."""
+    import streamlit as st
+
+    with st.expander(f'Diagnostics: section {run.section}', expanded=False):
+        table = pd.DataFrame([asdict(metrics) for metrics in run.steps.values()], index=list(run.steps))
+        table['alloc_mb'] = table.pop('alloc_bytes') / 1e6
+        st.dataframe(table.round(4))
+        st.caption(f'Peak traced memory {run.peak_bytes / 1e6:.1f} MB; data version {run.data_version}')
+        if run.profile:
+            st.code(run.profile, language='text')
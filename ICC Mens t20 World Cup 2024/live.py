@@ -0,0 +1,114 @@
+import io
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from data_loader import read_deliveries
+from derived import INNINGS_KEYS, derive_columns, innings_positions
+from stats import BASE_KEYS, MEASURES, base_table, position_table, stats_from_tables
+
+
+class LiveStats:
+    """Running tournament totals that are updated as new deliveries arrive.
+
+    Each update only groups the new rows and adds them into the running
+    totals, so the cost of ingesting a ball does not grow with the size of
+    the tournament. The state can be saved with ``save`` and restored with
+    ``LiveStats.load`` so a restart does not replay the whole history.
+    """
+
+    def __init__(self, overs=20):
+        # Overs per innings, which decides the phase boundaries
+        self.overs = overs
+        # {base key tuple: counters in MEASURES order}
+        self.base = {}
+        # {position: [balls, runs]}
+        self.positions = {}
+        # {(match_id, batting_team): balls faced so far}
+        self.innings_balls = {}
+        self.rows = 0
+        # Byte offset and header line of the CSV file followed by ingest_csv
+        self.csv_offset = 0
+        self.csv_header = None
+
+    def add_deliveries(self, deliveries):
+        """Add a frame of new deliveries (same columns as deliveries.csv)."""
+        if deliveries.empty:
+            return
+
+        # Continue each innings' ball count from where the last update stopped
+        innings = list(zip(*(deliveries[key].tolist() for key in INNINGS_KEYS)))
+        offsets = np.fromiter((self.innings_balls.get(key, 0) for key in innings),
+                              dtype='int64', count=len(innings))
+        positions = innings_positions(deliveries) + offsets
+        for key, balls in zip(innings, positions.tolist()):
+            self.innings_balls[key] = balls
+
+        derived = derive_columns(deliveries, positions, self.overs)
+        for row in base_table(deliveries, derived).itertuples(index=False):
+            key = tuple(row[:len(BASE_KEYS)])
+            totals = self.base.get(key)
+            values = np.array(row[len(BASE_KEYS):], dtype='int64')
+            if totals is None:
+                self.base[key] = values
+            else:
+                totals += values
+        for pos, row in position_table(deliveries, positions).iterrows():
+            totals = self.positions.setdefault(pos, [0, 0])
+            totals[0] += int(row['balls'])
+            totals[1] += int(row['runs'])
+
+        self.rows += len(deliveries)
+
+    def add_delivery(self, **delivery):
+        """Add a single delivery given as keyword arguments."""
+        delivery.setdefault('extras', 0)
+        delivery.setdefault('wicket_type', None)
+        self.add_deliveries(pd.DataFrame([delivery]))
+
+    def ingest_csv(self, path):
+        """Add the rows appended to ``path`` since the previous call.
+
+        Only complete lines are consumed; a partially written last line is
+        picked up by the next call. Returns the number of rows added.
+        """
+        with open(path, 'rb') as f:
+            if self.csv_header is None:
+                self.csv_header = f.readline()
+                self.csv_offset = f.tell()
+            if os.fstat(f.fileno()).st_size < self.csv_offset:
+                raise ValueError(f'{path} is shorter than the ingested offset; it was rewritten')
+            f.seek(self.csv_offset)
+            tail = f.read()
+        complete = tail[:tail.rfind(b'\n') + 1]
+        if not complete.strip():
+            return 0
+        deliveries = read_deliveries(io.BytesIO(self.csv_header + complete))
+        self.add_deliveries(deliveries)
+        self.csv_offset += len(complete)
+        return len(deliveries)
+
+    def to_stats(self):
+        """Return the running totals as a ``stats.TournamentStats``."""
+        base = pd.DataFrame(list(self.base.keys()), columns=BASE_KEYS)
+        counters = np.array(list(self.base.values()), dtype='int64').reshape(len(base), len(MEASURES))
+        base[MEASURES] = counters
+        positions = pd.DataFrame.from_dict(self.positions, orient='index', columns=['balls', 'runs'])
+        positions.index.name = 'position'
+        return stats_from_tables(base, positions.sort_index())
+
+    def save(self, path):
+        # Write to a temporary file first so a crash never leaves a torn snapshot
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        live = cls()
+        with open(path, 'rb') as f:
+            live.__dict__.update(pickle.load(f))
+        return live
@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from derived import derive_columns
+from stats import base_table, position_table, stats_from_tables
+
+# Partitions handed out per worker, so one slow partition does not leave
+# the other workers idle
+TASKS_PER_WORKER = 4
+
+# Frame and row order shared with the workers. Threads read them directly
+# and forked processes inherit them copy-on-write at fork time, so nothing is
+# pickled except row ranges and the per-partition results.
+_shared = {}
+_shared_lock = threading.Lock()
+
+# Long-lived thread pools, one per worker count: {workers: ThreadPoolExecutor}
+_thread_pools = {}
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _thread_pool(workers):
+    # Called with _shared_lock held
+    if workers not in _thread_pools:
+        _thread_pools[workers] = ThreadPoolExecutor(workers, thread_name_prefix='partition')
+    return _thread_pools[workers]
+
+
+def _process_pool(workers):
+    # fork lets workers read the parent's frame without copying it; where it
+    # is unavailable threads share it instead
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(workers)
+
+
+def _partitions(keys, count):
+    """Row order grouping equal ``keys`` together, cut into ``count`` ranges of whole groups."""
+    codes, _ = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    group_starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+    cuts = np.unique(np.linspace(0, len(group_starts), count + 1).astype(int))
+    bounds = np.r_[group_starts, len(order)][cuts]
+    return order, list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _run_partition(func, start, stop):
+    frame = _shared['frame']
+    return func(frame.take(_shared['order'][start:stop]), *_shared['args'])
+
+
+def map_partitions(func, frame, key='match_id', workers=None, args=(), processes=False):
+    """Apply ``func(part, *args)`` to partitions of whole ``key`` groups in parallel.
+
+    Partitions run on a long-lived thread pool (pandas and NumPy release the
+    GIL in most of the grouping work). With ``processes`` they run in forked
+    worker processes instead, on a pool built for this call. Only ask for
+    that from a single-threaded script such as the benchmark: forking a
+    threaded server like Streamlit copies locks other threads may hold.
+
+    Results are returned in ``key`` order whatever the order workers finish
+    in, so the output is deterministic. With ``processes`` ``func`` must be
+    a module-level function so it can be sent to worker processes.
+    """
+    workers = workers or default_workers()
+    order, ranges = _partitions(frame[key].to_numpy(), workers * TASKS_PER_WORKER)
+    with _shared_lock:
+        _shared.update(frame=frame, order=order, args=args)
+        try:
+            if workers == 1 or len(ranges) == 1:
+                return [_run_partition(func, start, stop) for start, stop in ranges]
+            if processes:
+                with _process_pool(workers) as pool:
+                    futures = [pool.submit(_run_partition, func, start, stop) for start, stop in ranges]
+                    return [future.result() for future in futures]
+            pool = _thread_pool(workers)
+            futures = [pool.submit(_run_partition, func, start, stop) for start, stop in ranges]
+            return [future.result() for future in futures]
+        finally:
+            _shared.clear()
+
+
+def _match_tables(deliveries, overs):
+    derived = derive_columns(deliveries, overs=overs)
+    positions = position_table(deliveries, derived['ball_number'].to_numpy())
+    return base_table(deliveries, derived), positions
+
+
+def build_stats_parallel(deliveries, overs=20, workers=None, processes=False):
+    """``stats.build_stats`` with the deliveries split by match across workers.
+
+    Every base-table row and every innings belongs to a single match, so the
+    per-partition base tables are simply concatenated and the batting
+    position tables summed; the result equals ``build_stats``. ``processes``
+    is passed to ``map_partitions``.
+    """
+    parts = map_partitions(_match_tables, deliveries, 'match_id', workers, (overs,), processes)
+    base = pd.concat([base for base, _ in parts], ignore_index=True)
+    positions = pd.concat([positions for _, positions in parts]).groupby(level='position').sum()
+    return stats_from_tables(base, positions)
@@ -0,0 +1,144 @@
+"""Indexed lookups of deliveries by player, team, match and player pair.
+
+Each index is the row order sorting the deliveries by one key (or a pair
+of keys), built once per data version with a stable argsort. A lookup
+binary-searches the sorted keys and returns the matching row positions as
+a view into that order, so it costs O(log n) plus the size of the result
+instead of a boolean-mask scan over every delivery. Rows come back in file
+order within each key. Where a key's rows are stored together (every
+match in Cricsheet files) they are a zero-copy ``iloc`` slice; otherwise
+only the matching rows are gathered.
+
+    index = get_index(load_data())
+    index.batter('V Kohli')
+    index.matchup('V Kohli', 'JJ Bumrah')
+    index.partnership('RG Sharma', 'V Kohli', totals=True)
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from stats import entity_table
+
+KEYS = ['striker', 'bowler', 'batting_team', 'match_id']
+PAIRS = [('striker', 'bowler'), ('striker', 'non_striker')]
+
+
+class _SortedIndex:
+    def __init__(self, codes):
+        order = np.argsort(codes, kind='stable')
+        self.order = order.astype(np.int32) if len(order) < 2 ** 31 else order
+        self.codes = codes[order]
+
+    def bounds(self, code):
+        return (int(np.searchsorted(self.codes, code, 'left')),
+                int(np.searchsorted(self.codes, code, 'right')))
+
+
+class DeliveryIndex:
+    """Sorted indexes over ``deliveries`` on ``KEYS`` and the player ``PAIRS``."""
+
+    def __init__(self, deliveries):
+        self.deliveries = deliveries
+        self._indexes = {key: _SortedIndex(self._codes(key)) for key in KEYS}
+        for first, second in PAIRS:
+            self._indexes[first, second] = _SortedIndex(self._pair_codes(first, second))
+
+    def _codes(self, column):
+        values = self.deliveries[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy()
+        return values.to_numpy()
+
+    def _code(self, column, value):
+        # Integer code of ``value`` in ``column``; None when it never occurs
+        dtype = self.deliveries[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            try:
+                return dtype.categories.get_loc(value)
+            except KeyError:
+                return None
+        return value
+
+    def _width(self, column):
+        # Codes run from -1 (missing) to the number of categories
+        return len(self.deliveries[column].cat.categories) + 1
+
+    def _pair_codes(self, first, second):
+        width = self._width(second)
+        return ((self._codes(first).astype(np.int64) + 1) * width
+                + self._codes(second).astype(np.int64) + 1)
+
+    def positions(self, key, value):
+        """Row positions where ``key`` equals ``value``; a read-only view, not a copy.
+
+        ``key`` is a column of ``KEYS`` or a pair of ``PAIRS`` with ``value``
+        a pair of values.
+        """
+        index = self._indexes[key]
+        if isinstance(key, tuple):
+            codes = [self._code(column, item) for column, item in zip(key, value)]
+            code = None if None in codes else (codes[0] + 1) * self._width(key[1]) + codes[1] + 1
+        else:
+            code = self._code(key, value)
+        if code is None:
+            return index.order[:0]
+        start, stop = index.bounds(code)
+        view = index.order[start:stop]
+        view.flags.writeable = False
+        return view
+
+    def rows(self, key, value):
+        """Deliveries where ``key`` equals ``value``, in file order."""
+        positions = self.positions(key, value)
+        # Positions ascend within a key, so the rows are one block exactly
+        # when the first and last are len - 1 apart
+        if len(positions) and positions[-1] - positions[0] == len(positions) - 1:
+            return self.deliveries.iloc[positions[0]:positions[-1] + 1]
+        return self.deliveries.take(positions)
+
+    def batter(self, name):
+        return self.rows('striker', name)
+
+    def bowler(self, name):
+        return self.rows('bowler', name)
+
+    def team(self, name):
+        return self.rows('batting_team', name)
+
+    def match(self, match_id):
+        return self.rows('match_id', match_id)
+
+    def matchup(self, batter, bowler, totals=False):
+        """Balls ``bowler`` delivered to ``batter``, or their totals with ``totals``."""
+        rows = self.rows(('striker', 'bowler'), (batter, bowler))
+        return entity_table(rows, ['striker', 'bowler']) if totals else rows
+
+    def partnership(self, first, second, totals=False):
+        """Balls faced by either batter with the other at the non-striker's end.
+
+        With ``totals`` this returns the matching rows of the ``partnerships``
+        table behind section 3.3, one per batter on strike.
+        """
+        key = ('striker', 'non_striker')
+        positions = np.sort(np.concatenate([self.positions(key, (first, second)),
+                                            self.positions(key, (second, first))]))
+        rows = self.deliveries.take(positions)
+        return entity_table(rows, list(key)) if totals else rows
+
+
+# Process-wide cache of built indexes, which hold the deliveries they index:
+# {(data_dir, overs, deliveries columns): (data version, DeliveryIndex)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_index(data):
+    """Return the ``DeliveryIndex`` for a ``data_loader.LoadedData``, building it once."""
+    with _cache_lock:
+        key = (data.data_dir, data.overs, tuple(data.deliveries.columns))
+        cached = _cache.get(key)
+        if cached is None or cached[0] != data.version:
+            cached = _cache[key] = (data.version, DeliveryIndex(data.deliveries))
+        return cached[1]
@@ -0,0 +1,410 @@
+from dataclasses import dataclass
+
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import streamlit as st
+
+from chart_cache import charts
+from instrumentation import render_step
+from stats import get_stats
+
+# Top-level groups of the dashboard, keyed by the first part of a section key
+GROUPS = {
+    '1': 'Matches Analysis',
+    '2': 'Player Performance Analysis',
+    '3': 'Batting Performance Analysis',
+    '4': 'Bowling Performance Analysis',
+}
+
+
+@dataclass(frozen=True)
+class Section:
+    """One analysis of the dashboard; ``render(data)`` computes and draws it."""
+    key: str
+    title: str
+    render: object
+
+    @property
+    def group(self):
+        return self.key.split('.')[0]
+
+    @property
+    def label(self):
+        return f'{self.key}. {self.title}'
+
+
+# Registered sections in dashboard order: {key: Section}
+SECTIONS = {}
+
+
+def section(key, title):
+    """Register the decorated function as the renderer of section ``key``."""
+    def register(render):
+        SECTIONS[key] = Section(key, title, render)
+        return render
+    return register
+
+
+def group_sections(group):
+    return [s for s in SECTIONS.values() if s.group == group]
+
+
+def show_chart(data, name, draw, **params):
+    # Charts are rendered once per data version and served as cached images
+    key = (data.data_dir, data.version, data.overs, name, tuple(sorted(params.items())))
+    with render_step():
+        image = charts.render(key, draw)
+    st.image(image)
+
+
+def _observed_counts(values):
+    counts = values.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts
+
+
+@section('1.1', 'Which team won the most matches?')
+def most_wins(data):
+    matches = data.matches
+    win_counts = matches['winner'].value_counts()
+    max_wins = win_counts.max()
+    teams_with_most_wins = win_counts[win_counts == max_wins].index.tolist()
+    teams_str = ", ".join(teams_with_most_wins)
+    st.write(f"Teams with the most wins: {teams_str} ({max_wins} wins)")
+
+
+@section('1.2', 'What is the win percentage of each team?')
+def win_percentage(data):
+    matches = data.matches
+    all_teams = pd.concat([matches['team1'], matches['team2']])
+    # Count only values that occur, on plain labels: the shared team categories
+    # also hold winner-only values such as 'No Result', which would otherwise
+    # show up as played zero times and divide by zero
+    total_matches = _observed_counts(all_teams)
+    team_wins = _observed_counts(matches['winner'])
+    win_percentage = (team_wins / total_matches) * 100
+    win_percentage_sorted = win_percentage.sort_values(ascending=False)
+    win_percentage_sorted = win_percentage_sorted[win_percentage_sorted > 0]
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(16, 10))
+        sns.barplot(x=win_percentage_sorted.index, y=win_percentage_sorted, ax=ax, palette="viridis")
+        ax.set_title('Win Percentage of Each Team', fontsize=20, weight='bold')
+        ax.set_xlabel('Teams', fontsize=16, weight='bold')
+        ax.set_ylabel('Win Percentage', fontsize=16, weight='bold')
+        ax.set_xticklabels(ax.get_xticklabels(), rotation=30, ha='right', fontsize=14, weight='bold')
+        ax.set_yticklabels(ax.get_yticklabels(), fontsize=14, weight='bold')
+        ax.set_ylim(0, 100)
+        return fig
+
+    show_chart(data, '1.2', draw)
+
+
+@section('1.3', 'How does the toss outcome affect the match result?')
+def toss_impact(data):
+    matches = data.matches
+    toss_match_outcome = matches[matches['toss_winner'] == matches['winner']]
+    toss_win_and_match_win_count = toss_match_outcome.shape[0]
+    total_matches_count = matches.shape[0]
+    st.write(f"Toss winner also won the match {toss_win_and_match_win_count} times out of {total_matches_count} matches.")
+
+
+@section('1.4', 'What are the most common venues for winning?')
+def winning_venues(data):
+    matches = data.matches
+    venue_wins = matches.groupby('venue', observed=True)['winner'].value_counts().sort_values(ascending=False)
+    most_common_venue = venue_wins.idxmax()[0]
+    st.write(f"The most common venue for winning: {most_common_venue}")
+
+
+@section('1.5', 'How often do teams win after choosing to bat or bowl?')
+def toss_decision_wins(data):
+    matches = data.matches
+    chosen_to_bat = matches[(matches['toss_decision'] == 'bat') & (matches['toss_winner'] == matches['winner'])]
+    chosen_to_field = matches[(matches['toss_decision'] == 'field') & (matches['toss_winner'] == matches['winner'])]
+    batting_win_percentage = (chosen_to_bat.shape[0] / matches.shape[0]) * 100
+    fielding_win_percentage = (chosen_to_field.shape[0] / matches.shape[0]) * 100
+    st.write(f"Percentage of wins after choosing to bat: {batting_win_percentage:.2f}%")
+    st.write(f"Percentage of wins after choosing to field: {fielding_win_percentage:.2f}%")
+
+
+@section('1.6', 'How does team performance vary between batting first and chasing targets?')
+def batting_first_vs_chasing(data):
+    matches = data.matches
+    batting_first = matches[matches['toss_decision'] == 'bat']
+    chasing_target = matches[matches['toss_decision'] == 'field']
+    batting_first_win_percentage = (batting_first[batting_first['winner'] == batting_first['team1']].shape[0] / batting_first.shape[0]) * 100
+    chasing_win_percentage = (chasing_target[chasing_target['winner'] == chasing_target['team2']].shape[0] / chasing_target.shape[0]) * 100
+    st.write(f"Win percentage batting first: {batting_first_win_percentage:.2f}%")
+    st.write(f"Win percentage chasing target: {chasing_win_percentage:.2f}%")
+
+
+@section('2.1', 'Top Run Scorers of the Tournament')
+def top_run_scorers(data):
+    stats = get_stats(data)
+    top_run_scorers = stats.batters['runs'].sort_values(ascending=False).head(10)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(x=top_run_scorers.values, y=top_run_scorers.index, ax=ax, palette='viridis')
+        ax.set_title('Top Run-Scorers of the Tournament', fontsize=20, weight='bold')
+        ax.set_xlabel('Runs Scored', fontsize=16, weight='bold')
+        ax.set_ylabel('Players', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '2.1', draw)
+
+
+@section('2.2', 'Top Wicket-Takers of the Tournament')
+def top_wicket_takers(data):
+    stats = get_stats(data)
+    top_wicket_takers = stats.bowlers['wickets'].sort_values(ascending=False).head(10)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(x=top_wicket_takers.values, y=top_wicket_takers.index, ax=ax, palette='plasma')
+        ax.set_title('Top Wicket-Takers of the Tournament', fontsize=20, weight='bold')
+        ax.set_xlabel('Wickets Taken', fontsize=16, weight='bold')
+        ax.set_ylabel('Bowlers', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '2.2', draw)
+
+
+@section('2.3', 'Players with the Highest Strike Rates (Runs > 150)')
+def highest_strike_rates(data):
+    stats = get_stats(data)
+    balls_faced = stats.batters['balls']
+    runs_scored = stats.batters['runs']
+    strike_rate = (runs_scored / balls_faced) * 100
+    filtered_strike_rate = strike_rate[runs_scored > 150]
+    top_strike_rates = filtered_strike_rate.sort_values(ascending=False).head(10)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(x=top_strike_rates.values, y=top_strike_rates.index, ax=ax, palette='coolwarm')
+        ax.set_title('Players with the Highest Strike Rates (Runs > 150)', fontsize=20, weight='bold')
+        ax.set_xlabel('Strike Rate', fontsize=16, weight='bold')
+        ax.set_ylabel('Players', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '2.3', draw)
+
+
+@section('2.4', 'Players with the Best Economy Rates (Minimum 150 Balls)')
+def best_economy_rates(data):
+    stats = get_stats(data)
+    balls_bowled = stats.bowlers['balls']
+    runs_conceded = stats.bowlers['conceded']
+    economy_rate = (runs_conceded / (balls_bowled / 6))
+    filtered_economy_rate = economy_rate[balls_bowled >= 150]
+    best_economy_rates = filtered_economy_rate.sort_values().head(10)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(x=best_economy_rates.values, y=best_economy_rates.index, ax=ax, palette='viridis')
+        ax.set_title('Players with the Best Economy Rates (Min 150 Balls Bowled)', fontsize=20, weight='bold')
+        ax.set_xlabel('Economy Rate', fontsize=16, weight='bold')
+        ax.set_ylabel('Bowlers', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '2.4', draw)
+
+
+@section('2.5', 'Consistent Batters')
+def consistent_batters(data):
+    stats = get_stats(data)
+    consistent_batsmen = stats.batter_matches['runs'].groupby('striker', observed=True).mean().sort_values(ascending=False).head(10)
+    consistent_batsmen = consistent_batsmen.reset_index().rename(columns={"striker": "Batsman", "runs": "Striking Rate"})
+    st.dataframe(consistent_batsmen)
+
+
+@section('2.6', 'Consistent Bowlers')
+def consistent_bowlers(data):
+    stats = get_stats(data)
+    match_wickets = stats.bowler_matches['wickets']
+    consistent_bowlers = match_wickets[match_wickets > 0].groupby('bowler', observed=True).mean().sort_values(ascending=False).head(10)
+    consistent_bowlers = consistent_bowlers.reset_index().rename(columns={"bowler": "Bowler", "wickets": 'Consistency in Economy'})
+    st.dataframe(consistent_bowlers)
+
+
+@section('2.7', 'Player Performances in Powerplay, Middle Overs, and Death Overs')
+def phase_performances(data):
+    stats = get_stats(data)
+    powerplay_performance = stats.batter_phases['Powerplay'].sort_values(ascending=False)
+    middle_overs_performance = stats.batter_phases['Middle Overs'].sort_values(ascending=False)
+    death_overs_performance = stats.batter_phases['Death Overs'].sort_values(ascending=False)
+    top10_powerplay = powerplay_performance.head(10).sort_values(ascending=False)
+    top10_middle_overs = middle_overs_performance.head(10).sort_values(ascending=False)
+    top10_death_overs = death_overs_performance.head(10).sort_values(ascending=False)
+
+    def draw():
+        fig, axes = plt.subplots(3, 1, figsize=(12, 18))
+        sns.barplot(x=top10_powerplay.values, y=top10_powerplay.index, ax=axes[0], palette="Blues_d")
+        axes[0].set_title('Top 10 Players in Powerplay', fontsize=20, weight='bold')
+        axes[0].set_xlabel('Runs Scored', fontsize=16, weight='bold')
+        axes[0].set_ylabel('Player', fontsize=16, weight='bold')
+        sns.barplot(x=top10_middle_overs.values, y=top10_middle_overs.index, ax=axes[1], palette="Greens_d")
+        axes[1].set_title('Top 10 Players in Middle Overs', fontsize=20, weight='bold')
+        axes[1].set_xlabel('Runs Scored', fontsize=16, weight='bold')
+        axes[1].set_ylabel('Player', fontsize=16, weight='bold')
+        sns.barplot(x=top10_death_overs.values, y=top10_death_overs.index, ax=axes[2], palette="Reds_d")
+        axes[2].set_title('Top 10 Players in Death Overs', fontsize=20, weight='bold')
+        axes[2].set_xlabel('Runs Scored', fontsize=16, weight='bold')
+        axes[2].set_ylabel('Player', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '2.7', draw)
+
+
+@section('3.1', 'Teams score the most runs per over')
+def runs_per_over(data):
+    stats = get_stats(data)
+    team_runs = stats.teams['runs']
+    team_balls = stats.teams['balls']
+    runs_per_over = team_runs / (team_balls / 6)
+    most_runs_per_over = runs_per_over.sort_values(ascending=False)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(x=most_runs_per_over.values, y=most_runs_per_over.index, ax=ax, palette='viridis')
+        ax.set_title('Runs Per Over for Each Team', fontsize=20, weight='bold')
+        ax.set_xlabel('Runs Per Over', fontsize=16, weight='bold')
+        ax.set_ylabel('Teams', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.1', draw)
+
+
+@section('3.2', 'Batting Performance vary by batting position')
+def batting_positions(data):
+    stats = get_stats(data)
+    batting_positions = stats.positions['runs']
+    balls_faced_positions = stats.positions['balls']
+    runs_per_ball_position = batting_positions / balls_faced_positions
+    runs_per_ball_position_df = runs_per_ball_position.reset_index()
+    runs_per_ball_position_df.columns = ['Batting Position', 'Runs Per Ball']
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.lineplot(data=runs_per_ball_position_df, x='Batting Position', y='Runs Per Ball', marker='o', color='purple', linewidth=2.5, ax=ax)
+        ax.set_title('Average Runs Per Ball by Batting Position', fontsize=20, weight='bold')
+        ax.set_xlabel('Batting Position (Cumulative Balls Faced)', fontsize=16, weight='bold')
+        ax.set_ylabel('Average Runs Per Ball', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.2', draw)
+
+
+@section('3.3', 'Most Successful Batting Partnerships')
+def partnerships(data):
+    stats = get_stats(data)
+    successful_partnerships = stats.partnerships['runs'].sort_values(ascending=False).reset_index()
+    top_partnerships = successful_partnerships.head(10).copy()
+    top_partnerships['partnership'] = top_partnerships['striker'].astype(str) + ' & ' + top_partnerships['non_striker'].astype(str)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(data=top_partnerships, x='runs', y='partnership', ax=ax, palette='viridis')
+        ax.set_title('Top 10 Successful Partnerships in the Tournament', fontsize=20, weight='bold')
+        ax.set_xlabel('Total Runs Scored', fontsize=16, weight='bold')
+        ax.set_ylabel('Partnership', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.3', draw)
+
+
+@section('3.4', 'Frequency of Boundaries Affect the Overall Score')
+def boundary_percentage(data):
+    stats = get_stats(data)
+    team_boundaries = stats.teams['fours'] + stats.teams['sixes']
+    team_total_runs = stats.teams['runs']
+    boundary_percentage = (team_boundaries / team_total_runs) * 100
+    boundary_percentage = boundary_percentage.reset_index()
+    boundary_percentage.columns = ['batting_team', 'boundary_percentage']
+    boundary_percentage = boundary_percentage.sort_values(by='boundary_percentage', ascending=False)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(data=boundary_percentage, x='boundary_percentage', y='batting_team', ax=ax, palette='coolwarm')
+        ax.set_title('Percentage of Runs from Boundaries by Team', fontsize=20, weight='bold')
+        ax.set_xlabel('Boundary Percentage', fontsize=16, weight='bold')
+        ax.set_ylabel('Team', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.4', draw)
+
+
+@section('3.5', 'Percentage of Balls are Dot Balls')
+def dot_ball_percentage(data):
+    stats = get_stats(data)
+    team_balls = stats.teams['balls']
+    team_dot_balls = stats.teams['dots']
+    dot_ball_percentage = (team_dot_balls / team_balls) * 100
+    dot_ball_percentage = dot_ball_percentage.reset_index()
+    dot_ball_percentage.columns = ['batting_team', 'dot_ball_percentage']
+    dot_ball_percentage = dot_ball_percentage.sort_values(by='dot_ball_percentage', ascending=False)
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(14, 8))
+        sns.barplot(data=dot_ball_percentage, x='dot_ball_percentage', y='batting_team', ax=ax, palette='YlGnBu')
+        ax.set_title('Percentage of Dot Balls by Team', fontsize=20, weight='bold')
+        ax.set_xlabel('Dot Ball Percentage', fontsize=16, weight='bold')
+        ax.set_ylabel('Team', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.5', draw)
+
+
+@section('3.6', 'Relationship between Strike Rate and Average Runs per Over for Different Batsmen')
+def strike_rate_vs_runs_per_over(data):
+    stats = get_stats(data)
+    batsman_runs = stats.batters['runs']
+    batsman_balls = stats.batters['balls']
+    strike_rate = (batsman_runs / batsman_balls) * 100
+    batsman_runs_per_over = batsman_runs / (batsman_balls / 6)
+    strike_rate_runs_per_over = pd.DataFrame({'Strike Rate': strike_rate, 'Runs per Over': batsman_runs_per_over})
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(12, 8))
+        ax.scatter(strike_rate_runs_per_over['Strike Rate'], strike_rate_runs_per_over['Runs per Over'], alpha=0.8, color='b')
+        ax.set_title('Relationship between Strike Rate and Runs per Over', fontsize=20, weight='bold')
+        ax.set_xlabel('Strike Rate', fontsize=16, weight='bold')
+        ax.set_ylabel('Runs per Over', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.6', draw)
+
+
+@section('3.7', 'How do different batting orders (opening vs. middle order) affect total scores?')
+def batting_order_runs(data):
+    stats = get_stats(data)
+    order_runs = stats.batting_orders['runs']
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.bar(order_runs.index, order_runs.values, color=['skyblue', 'lightgreen'])
+        ax.set_title('Total Runs by Batting Order', fontsize=20, weight='bold')
+        ax.set_xlabel('Batting Order', fontsize=16, weight='bold')
+        ax.set_ylabel('Total Runs', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '3.7', draw)
+
+
+@section('4.1', "The Impact of Dot Balls on the Opposition's Scoring Rate")
+def dot_ball_impact(data):
+    stats = get_stats(data)
+    dot_ball_impact = stats.matches['dots'] / stats.matches['balls']
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.scatter(dot_ball_impact.index, dot_ball_impact * 100, color='red', alpha=0.5)
+        ax.set_title('Impact of Dot Balls on Scoring Rate', fontsize=20, weight='bold')
+        ax.set_xlabel('Match ID', fontsize=16, weight='bold')
+        ax.set_ylabel('Dot Ball Percentage (%)', fontsize=16, weight='bold')
+        return fig
+
+    show_chart(data, '4.1', draw)
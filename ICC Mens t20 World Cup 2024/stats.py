@@ -0,0 +1,181 @@
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from derived import BATTING_ORDER_DTYPE, OPENING_BALLS, PHASES, derive_columns
+
+# Counters summed for every group; each one is an int8 0/1 flag or a run count
+MEASURES = ['balls', 'runs', 'conceded', 'wickets', 'dots', 'fours', 'sixes']
+
+# Grain of the base table that every other table is rolled up from
+BASE_KEYS = ['match_id', 'batting_team', 'striker', 'non_striker', 'bowler', 'phase']
+
+
+@dataclass(frozen=True)
+class TournamentStats:
+    """Per-batter, per-bowler, per-team and per-match tables for the app.
+
+    Every table is rolled up from ``base``, which is built with a single
+    group-by over the deliveries, so drawing more charts does not add more
+    scans of the ball-by-ball data.
+    """
+    base: pd.DataFrame
+    batters: pd.DataFrame
+    bowlers: pd.DataFrame
+    teams: pd.DataFrame
+    matches: pd.DataFrame
+    batter_matches: pd.DataFrame
+    bowler_matches: pd.DataFrame
+    partnerships: pd.DataFrame
+    batter_phases: pd.DataFrame
+    positions: pd.DataFrame
+    batting_orders: pd.DataFrame
+
+
+def _counters(deliveries):
+    runs = deliveries['runs_off_bat'].to_numpy()
+    return pd.DataFrame({
+        'balls': np.ones(len(deliveries), dtype='int8'),
+        'runs': runs,
+        'conceded': runs + deliveries['extras'].to_numpy(),
+        'wickets': deliveries['wicket_type'].notna().to_numpy().astype('int8'),
+        'dots': (runs == 0).astype('int8'),
+        'fours': (runs == 4).astype('int8'),
+        'sixes': (runs == 6).astype('int8'),
+    }, index=deliveries.index)
+
+
+def _rollup(base, keys):
+    return base.groupby(keys, observed=True)[MEASURES].sum()
+
+
+def _plain_labels(index):
+    # Categorical labels would make charts draw an empty slot for every
+    # category, not just the rows of a (small) entity table
+    if isinstance(index, pd.MultiIndex):
+        return index.set_levels([_plain_labels(level) for level in index.levels])
+    if isinstance(index, pd.CategoricalIndex):
+        return pd.Index(index.astype(index.categories.dtype), name=index.name)
+    return index
+
+
+def _table(base, keys):
+    table = _rollup(base, keys)
+    table.index = _plain_labels(table.index)
+    return table
+
+
+def entity_table(deliveries, keys):
+    """Totals of ``deliveries`` grouped straight by ``keys``, without a base table."""
+    scan = _counters(deliveries)
+    for key in [keys] if isinstance(keys, str) else keys:
+        scan[key] = deliveries[key]
+    return _table(scan, keys)
+
+
+def batting_rates(batters):
+    """Strike rate and dot/boundary percentages of a batters (or teams) table."""
+    return pd.DataFrame({
+        'strike_rate': batters['runs'] / batters['balls'] * 100,
+        'dot_percentage': batters['dots'] / batters['balls'] * 100,
+        'boundary_percentage': (batters['fours'] + batters['sixes']) / batters['balls'] * 100,
+    })
+
+
+def bowling_rates(bowlers):
+    """Economy and dot-ball percentage of a bowlers table."""
+    return pd.DataFrame({
+        'economy': bowlers['conceded'] / (bowlers['balls'] / 6),
+        'dot_percentage': bowlers['dots'] / bowlers['balls'] * 100,
+    })
+
+
+def base_table(deliveries, derived=None):
+    """Group deliveries at the finest grain any dashboard table needs."""
+    if derived is None:
+        derived = derive_columns(deliveries)
+    scan = _counters(deliveries)
+    for key in BASE_KEYS[:-1]:
+        scan[key] = deliveries[key]
+    scan['phase'] = derived['phase'].cat.codes
+    return _rollup(scan, BASE_KEYS).reset_index()
+
+
+def position_table(deliveries, positions):
+    # Balls and runs at each innings position; this is the only per-row
+    # quantity that cannot be rolled up from the base table
+    scan = pd.DataFrame({'balls': 1, 'runs': deliveries['runs_off_bat'].to_numpy()},
+                        index=deliveries.index)
+    return scan.groupby(pd.Index(positions, name='position')).sum()
+
+
+def stats_from_tables(base, positions):
+    """Roll the base and position tables up into a ``TournamentStats``."""
+    batter_phases = base.pivot_table(index='striker', columns='phase', values='runs',
+                                     aggfunc='sum', fill_value=0, observed=True)
+    # Every phase gets a column, even before an innings has reached it
+    batter_phases = batter_phases.rename(columns=dict(enumerate(PHASES)))
+    batter_phases = batter_phases.reindex(columns=PHASES, fill_value=0)
+    batter_phases.index = _plain_labels(batter_phases.index)
+
+    order_codes = (positions.index.to_numpy() > OPENING_BALLS).astype('int8')
+    order = pd.Categorical.from_codes(order_codes, dtype=BATTING_ORDER_DTYPE)
+    batting_orders = positions.groupby(pd.Index(order, name='batting_order'), observed=True).sum()
+
+    return TournamentStats(
+        base=base,
+        batters=_table(base, 'striker'),
+        bowlers=_table(base, 'bowler'),
+        teams=_table(base, 'batting_team'),
+        matches=_table(base, 'match_id'),
+        batter_matches=_table(base, ['match_id', 'striker']),
+        bowler_matches=_table(base, ['match_id', 'bowler']),
+        partnerships=_table(base, ['striker', 'non_striker']),
+        batter_phases=batter_phases,
+        positions=positions,
+        batting_orders=batting_orders,
+    )
+
+
+def build_stats(deliveries, overs=20):
+    derived = derive_columns(deliveries, overs=overs)
+    positions = position_table(deliveries, derived['ball_number'].to_numpy())
+    return stats_from_tables(base_table(deliveries, derived), positions)
+
+
+# Deliveries from which get_stats splits the build by match across worker
+# threads. Off by default: the threaded build has not yet been shown to beat
+# the serial one (see benchmark.py's stats_serial and stats_parallel steps).
+# Set DASHBOARD_PARALLEL_MIN_ROWS to opt in.
+PARALLEL_MIN_ROWS = int(os.environ.get('DASHBOARD_PARALLEL_MIN_ROWS', 0)) or None
+
+# Process-wide cache of built stats: {(data_dir, overs): (data version, TournamentStats)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_stats(data):
+    """Return the stats for a ``data_loader.LoadedData``, building them once."""
+    with _cache_lock:
+        key = (data.data_dir, data.overs)
+        cached = _cache.get(key)
+        if cached is None or cached[0] != data.version:
+            if (PARALLEL_MIN_ROWS is not None and len(data.deliveries) >= PARALLEL_MIN_ROWS
+                    and (os.cpu_count() or 1) > 1):
+                # Imported here because parallel builds on this module
+                from parallel import build_stats_parallel
+                stats = build_stats_parallel(data.deliveries, data.overs)
+            else:
+                stats = build_stats(data.deliveries, data.overs)
+            cached = _cache[key] = (data.version, stats)
+    # Instrumented runs (see instrumentation.py) count the rows of the tables read
+    track = getattr(data, 'track', None)
+    return track(cached[1]) if track else cached[1]
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
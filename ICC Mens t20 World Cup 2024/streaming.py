@@ -0,0 +1,76 @@
+"""Batter, bowler and team totals for deliveries files larger than memory.
+
+The file is read in chunks; each chunk is grouped on its own and its
+integer totals are merged into running per-player and per-team tables.
+Peak memory is one chunk plus those tables, whatever the size of the
+file. Rates are computed from the merged totals at the end, so results
+are identical to the in-memory ``stats`` tables.
+
+    python streaming.py archive/deliveries.csv --chunksize 1000000
+"""
+import argparse
+from dataclasses import dataclass
+
+import pandas as pd
+
+from data_loader import DELIVERIES_DTYPES
+from stats import batting_rates, bowling_rates, entity_table
+
+# Only the columns the streamed tables need are parsed
+COLUMNS = ['batting_team', 'striker', 'bowler', 'runs_off_bat', 'extras', 'wicket_type']
+TABLE_KEYS = {'batters': 'striker', 'bowlers': 'bowler', 'teams': 'batting_team'}
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+@dataclass(frozen=True)
+class StreamedStats:
+    """The same ``batters``, ``bowlers`` and ``teams`` tables as ``stats``."""
+    batters: pd.DataFrame
+    bowlers: pd.DataFrame
+    teams: pd.DataFrame
+    rows: int
+
+    def batting_rates(self):
+        return batting_rates(self.batters)
+
+    def bowling_rates(self):
+        return bowling_rates(self.bowlers)
+
+
+def _merge(total, part):
+    if total is None:
+        return part
+    # Concatenate and re-group rather than DataFrame.add, which would turn
+    # the integer totals into floats wherever the indexes do not overlap
+    return pd.concat([total, part]).groupby(level=0).sum()
+
+
+def stream_stats(path, chunksize=DEFAULT_CHUNKSIZE):
+    dtypes = {column: DELIVERIES_DTYPES[column] for column in COLUMNS}
+    tables = dict.fromkeys(TABLE_KEYS)
+    rows = 0
+    with pd.read_csv(path, usecols=COLUMNS, dtype=dtypes, chunksize=chunksize) as chunks:
+        for chunk in chunks:
+            for name, key in TABLE_KEYS.items():
+                tables[name] = _merge(tables[name], entity_table(chunk, key))
+            rows += len(chunk)
+    return StreamedStats(rows=rows, **{name: table.sort_index() for name, table in tables.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate a deliveries CSV in chunks.')
+    parser.add_argument('path', help='deliveries CSV file')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows read per chunk')
+    parser.add_argument('--top', type=int, default=10, help='rows shown per table')
+    args = parser.parse_args()
+
+    streamed = stream_stats(args.path, args.chunksize)
+    batters = streamed.batters.join(streamed.batting_rates())
+    bowlers = streamed.bowlers.join(streamed.bowling_rates())
+    print(f'{streamed.rows} deliveries')
+    print(batters.sort_values('runs', ascending=False).head(args.top).round(2).to_string())
+    print(bowlers.sort_values('wickets', ascending=False).head(args.top).round(2).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""Technical indicators computed from raw OHLCV bars.
+
+``compute_indicators`` derives every indicator column of
+``tsla_2014_2023.csv`` (RSI, CCI, SMA/EMA, MACD, Bollinger middle band, true
+range, ATR and next-day close), plus returns, annualised 20-day volatility
+and the Bollinger bands, from the date/open/high/low/close/volume columns
+alone. Each indicator is one vectorized rolling or exponential pass.
+``batch_indicators`` does the same for many tickers stacked in one frame,
+with windows restarting at every ticker. ``IndicatorState`` keeps the
+rolling state after the last bar, so each new bar updates every indicator
+without recomputing whole windows.
+
+The formulas match the CSV's own columns. Moving averages are EMAs of the
+given span, RSI and ATR use Wilder smoothing, CCI uses the mean absolute
+deviation with the 0.015 constant, MACD is EMA 12 minus EMA 26, and
+``bollinger`` is the 20-day SMA the bands sit around.
+
+    python indicators.py tsla_2014_2023.csv --output tsla_indicators.csv
+    python indicators.py tsla.csv nvda.csv aapl.csv --output batch.csv
+"""
+import argparse
+import math
+import os
+import pickle
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+OHLCV = ['date', 'open', 'high', 'low', 'close', 'volume']
+# Columns of tsla_2014_2023.csv, in its order
+CSV_COLUMNS = OHLCV + ['rsi_7', 'rsi_14', 'cci_7', 'cci_14', 'sma_50', 'ema_50', 'sma_100', 'ema_100',
+                       'macd', 'bollinger', 'TrueRange', 'atr_7', 'atr_14', 'next_day_close']
+EXTRA_COLUMNS = ['returns', 'volatility_20', 'bollinger_upper', 'bollinger_lower']
+
+RSI_WINDOWS = [7, 14]
+CCI_WINDOWS = [7, 14]
+ATR_WINDOWS = [7, 14]
+MA_WINDOWS = [50, 100]
+MACD_SPANS = (12, 26)
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2
+VOLATILITY_WINDOW = 20
+TRADING_DAYS = 252
+CCI_CONSTANT = 0.015
+
+
+def read_ohlcv(path):
+    """Read only the raw bar columns of a price CSV."""
+    return pd.read_csv(path, usecols=OHLCV, parse_dates=['date'],
+                       dtype={column: 'float64' for column in ['open', 'high', 'low', 'close']})
+
+
+def _rsi(gain, loss):
+    # Works on arrays and scalars alike; no losses gives 100 as in pandas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + np.divide(gain, loss))
+
+
+def _cci(typical, mean, mad):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.divide(typical - mean, CCI_CONSTANT * mad)
+
+
+class _Passes:
+    """Rolling and exponential passes over columns of one or many tickers.
+
+    With ``keys`` every window restarts at each ticker: rolling results are
+    blanked until a ticker has a full window of its own, and exponential
+    averages run per ticker.
+    """
+
+    def __init__(self, keys=None):
+        self.keys = keys
+        if keys is not None:
+            # Position of each bar within its ticker
+            self.position = keys.groupby(keys, sort=False).cumcount().to_numpy()
+
+    def _own(self, result, window):
+        if self.keys is None:
+            return result
+        return result.where(self.position >= window - 1)
+
+    def shift(self, series):
+        return self._own(series.shift(), 2)
+
+    def next(self, series):
+        if self.keys is None:
+            return series.shift(-1)
+        return series.groupby(self.keys, sort=False).shift(-1)
+
+    def mean(self, series, window):
+        return self._own(series.rolling(window).mean(), window)
+
+    def std(self, series, window):
+        return self._own(series.rolling(window).std(), window)
+
+    def mad(self, series, window):
+        # Mean absolute deviation from each window's own mean
+        values = series.to_numpy()
+        result = np.full(len(values), np.nan)
+        if len(values) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(values, window)
+            result[window - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+        return self._own(pd.Series(result, index=series.index), window)
+
+    def ewm(self, series, span=None, alpha=None):
+        if self.keys is None:
+            return series.ewm(span=span, alpha=alpha, adjust=False).mean()
+        grouped = series.groupby(self.keys, sort=False).ewm(span=span, alpha=alpha, adjust=False).mean()
+        return grouped.droplevel(0).reindex(series.index)
+
+
+def _indicators(ohlcv, keys=None):
+    """Indicator columns and the smoothing state behind them."""
+    passes = _Passes(keys)
+    close, high, low = ohlcv['close'], ohlcv['high'], ohlcv['low']
+    previous = passes.shift(close)
+    typical = (high + low + close) / 3
+    out = {}
+    state = {}
+
+    change = close - previous
+    gains, losses = change.clip(lower=0), -change.clip(upper=0)
+    for window in RSI_WINDOWS:
+        gain = state[f'gain_{window}'] = passes.ewm(gains, alpha=1 / window)
+        loss = state[f'loss_{window}'] = passes.ewm(losses, alpha=1 / window)
+        out[f'rsi_{window}'] = _rsi(gain, loss)
+    for window in CCI_WINDOWS:
+        out[f'cci_{window}'] = _cci(typical, passes.mean(typical, window), passes.mad(typical, window))
+    for window in MA_WINDOWS:
+        out[f'sma_{window}'] = passes.mean(close, window)
+        out[f'ema_{window}'] = passes.ewm(close, span=window)
+    for span in MACD_SPANS:
+        state[f'ema_{span}'] = passes.ewm(close, span=span)
+    out['macd'] = state[f'ema_{MACD_SPANS[0]}'] - state[f'ema_{MACD_SPANS[1]}']
+
+    middle = out['bollinger'] = passes.mean(close, BOLLINGER_WINDOW)
+    width = BOLLINGER_WIDTH * passes.std(close, BOLLINGER_WINDOW)
+    true_range = out['TrueRange'] = pd.concat(
+        [high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+    for window in ATR_WINDOWS:
+        out[f'atr_{window}'] = passes.ewm(true_range, alpha=1 / window)
+    out['next_day_close'] = passes.next(close)
+
+    returns = out['returns'] = close / previous - 1
+    out['volatility_20'] = passes.std(returns, VOLATILITY_WINDOW) * math.sqrt(TRADING_DAYS)
+    out['bollinger_upper'] = middle + width
+    out['bollinger_lower'] = middle - width
+    return pd.DataFrame(out, index=ohlcv.index), state
+
+
+def compute_indicators(ohlcv):
+    """``ohlcv`` with every indicator of ``CSV_COLUMNS`` and ``EXTRA_COLUMNS`` added.
+
+    Rows must be in date order. Rolling indicators are NaN until their window
+    is full, as with pandas ``rolling``.
+    """
+    ohlcv = ohlcv[OHLCV].reset_index(drop=True)
+    indicators, _ = _indicators(ohlcv)
+    return pd.concat([ohlcv, indicators], axis=1)[CSV_COLUMNS + EXTRA_COLUMNS]
+
+
+def batch_indicators(ohlcv, by='ticker'):
+    """``compute_indicators`` for many tickers at once.
+
+    ``ohlcv`` holds the bars of every ticker with a ``by`` column naming it.
+    The result is sorted by ticker and date, and no window spans two
+    tickers. Each indicator is still one pass over all rows rather than one
+    per ticker.
+    """
+    ohlcv = ohlcv[[by] + OHLCV].sort_values([by, 'date'], kind='stable').reset_index(drop=True)
+    indicators, _ = _indicators(ohlcv, ohlcv[by])
+    return pd.concat([ohlcv, indicators], axis=1)[[by] + CSV_COLUMNS + EXTRA_COLUMNS]
+
+
+class _Window:
+    """Last ``size`` values with their running mean and sum of squared deviations."""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value):
+        if len(self.values) < self.size:
+            delta = value - self.mean
+            self.values.append(value)
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+        else:
+            # Replace the oldest value: O(1) whatever the window size
+            oldest = self.values.popleft()
+            self.values.append(value)
+            mean = self.mean + (value - oldest) / self.size
+            self.m2 = max(self.m2 + (value - oldest) * (value - mean + oldest - self.mean), 0.0)
+            self.mean = mean
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def average(self):
+        return self.mean if self.full else math.nan
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.size - 1)) if self.full else math.nan
+
+    def mad(self):
+        # O(window); the CCI windows are 7 and 14 bars
+        if not self.full:
+            return math.nan
+        return sum(abs(value - self.mean) for value in self.values) / self.size
+
+
+def _smooth(previous, value, alpha):
+    # One step of pandas' ewm(adjust=False); the first value starts it
+    if math.isnan(value):
+        return previous
+    return value if math.isnan(previous) else previous + alpha * (value - previous)
+
+
+class IndicatorState:
+    """Rolling state of every indicator after the last bar seen.
+
+    ``update`` takes one new bar and returns its indicator row in O(1)
+    (CCI's mean deviation re-reads its 14-bar window). Rows match
+    ``compute_indicators`` over the whole history, except ``next_day_close``,
+    which is not known until the next bar arrives. ``save`` and
+    ``IndicatorState.load`` keep the state between runs, so a restart does
+    not reread the price history.
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self.close = math.nan
+        self.smoothed = dict.fromkeys(
+            [f'gain_{w}' for w in RSI_WINDOWS] + [f'loss_{w}' for w in RSI_WINDOWS]
+            + [f'ema_{w}' for w in MA_WINDOWS] + [f'ema_{s}' for s in MACD_SPANS]
+            + [f'atr_{w}' for w in ATR_WINDOWS], math.nan)
+        self.closes = {w: _Window(w) for w in sorted(set(MA_WINDOWS + [BOLLINGER_WINDOW]))}
+        self.typical = {w: _Window(w) for w in CCI_WINDOWS}
+        self.returns = _Window(VOLATILITY_WINDOW)
+
+    @classmethod
+    def from_history(cls, ohlcv):
+        """State after the bars of ``ohlcv``, taken from one vectorized pass."""
+        ohlcv = ohlcv[OHLCV].reset_index(drop=True)
+        indicators, smoothing = _indicators(ohlcv)
+        state = cls()
+        state.bars = len(ohlcv)
+        if not len(ohlcv):
+            return state
+        state.close = float(ohlcv['close'].iloc[-1])
+        for name in state.smoothed:
+            series = smoothing.get(name, indicators.get(name))
+            state.smoothed[name] = float(series.iloc[-1])
+        for window, values in state.closes.items():
+            for value in ohlcv['close'].iloc[-window:]:
+                values.push(float(value))
+        typical = (ohlcv['high'] + ohlcv['low'] + ohlcv['close']) / 3
+        for window, values in state.typical.items():
+            for value in typical.iloc[-window:]:
+                values.push(float(value))
+        for value in indicators['returns'].dropna().iloc[-VOLATILITY_WINDOW:]:
+            state.returns.push(float(value))
+        return state
+
+    def update(self, date, open, high, low, close, volume):
+        """Add one bar and return its row of ``CSV_COLUMNS`` and ``EXTRA_COLUMNS``."""
+        previous = self.close
+        smoothed = self.smoothed
+        row = {'date': date, 'open': open, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+        change = close - previous
+        # No change (NaN) on the first bar
+        gain, loss = (change, change) if math.isnan(change) else (max(change, 0.0), max(-change, 0.0))
+        for window in RSI_WINDOWS:
+            smoothed[f'gain_{window}'] = _smooth(smoothed[f'gain_{window}'], gain, 1 / window)
+            smoothed[f'loss_{window}'] = _smooth(smoothed[f'loss_{window}'], loss, 1 / window)
+            row[f'rsi_{window}'] = float(_rsi(smoothed[f'gain_{window}'], smoothed[f'loss_{window}']))
+
+        typical = (high + low + close) / 3
+        for window, values in self.typical.items():
+            values.push(typical)
+            row[f'cci_{window}'] = float(_cci(typical, values.average(), values.mad()))
+
+        for window, values in self.closes.items():
+            values.push(close)
+        for window in MA_WINDOWS:
+            row[f'sma_{window}'] = self.closes[window].average()
+            row[f'ema_{window}'] = smoothed[f'ema_{window}'] = _smooth(smoothed[f'ema_{window}'], close,
+                                                                       2 / (window + 1))
+        for span in MACD_SPANS:
+            smoothed[f'ema_{span}'] = _smooth(smoothed[f'ema_{span}'], close, 2 / (span + 1))
+        row['macd'] = smoothed[f'ema_{MACD_SPANS[0]}'] - smoothed[f'ema_{MACD_SPANS[1]}']
+
+        bollinger = self.closes[BOLLINGER_WINDOW]
+        row['bollinger'] = bollinger.average()
+        true_range = high - low if math.isnan(previous) else max(high - low, abs(high - previous),
+                                                                 abs(low - previous))
+        row['TrueRange'] = true_range
+        for window in ATR_WINDOWS:
+            row[f'atr_{window}'] = smoothed[f'atr_{window}'] = _smooth(smoothed[f'atr_{window}'], true_range,
+                                                                       1 / window)
+        row['next_day_close'] = math.nan
+
+        returns = row['returns'] = close / previous - 1
+        if not math.isnan(returns):
+            self.returns.push(returns)
+        row['volatility_20'] = self.returns.std() * math.sqrt(TRADING_DAYS)
+        width = BOLLINGER_WIDTH * bollinger.std()
+        row['bollinger_upper'] = row['bollinger'] + width
+        row['bollinger_lower'] = row['bollinger'] - width
+
+        self.close = close
+        self.bars += 1
+        return row
+
+    def save(self, path):
+        # Write to a temporary file first so a crash never leaves a torn snapshot
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        state = cls()
+        with open(path, 'rb') as f:
+            state.__dict__.update(pickle.load(f))
+        return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute technical indicators from OHLCV price CSVs.')
+    parser.add_argument('paths', nargs='+', help='CSV files with date/open/high/low/close/volume columns')
+    parser.add_argument('--output', required=True, help='CSV file the indicators are written to')
+    parser.add_argument('--extra', action='store_true',
+                        help='also write returns, volatility and the Bollinger bands')
+    args = parser.parse_args()
+
+    if len(args.paths) == 1:
+        result = compute_indicators(read_ohlcv(args.paths[0]))
+        columns = CSV_COLUMNS
+    else:
+        # One ticker per file, named after it
+        frames = {os.path.splitext(os.path.basename(path))[0]: read_ohlcv(path) for path in args.paths}
+        bars = pd.concat(frames, names=['ticker']).reset_index(level='ticker')
+        result = batch_indicators(bars)
+        columns = ['ticker'] + CSV_COLUMNS
+    if args.extra:
+        columns = columns + EXTRA_COLUMNS
+    result.to_csv(args.output, columns=columns, index=False, date_format='%Y-%m-%d')
+    print(f'wrote {len(result)} rows to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""Pre-aggregated cubes over the Superstore and British Airways booking data.
+
+A cube sums additive measures (sales, profit, quantity, bookings, ...) over
+a dataset's categorical dimensions once and stores the results as
+cuboids, each one group-by over a subset of the dimensions. It keeps:
+
+* the base cuboid over every dimension, which can answer any query;
+* every subset of the low-cardinality dimensions (region, segment, channel,
+  trip type, ...), each only a few hundred cells;
+* the extra cuboids a dataset lists, such as route x channel x trip type.
+
+A query is answered from the smallest cuboid holding its dimensions. Roll
+up by dropping dimensions from ``by``, drill down by adding them, and
+filter with ``where``. Raw rows are never rescanned. Ratios such as
+profit margin or completion rate are computed from the summed parts
+after aggregation, so they stay exact at every level.
+
+Cubes are saved next to their CSV as compressed, dictionary-encoded
+``.cube.npz`` files and rebuilt when the CSV changes.
+
+    python olap_cube.py build
+    python olap_cube.py query superstore --by Region Category --where Segment=Consumer
+    python olap_cube.py query booking --by route --where trip_type=RoundTrip --sort bookings --top 10
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Dimensions with at most this many values get every combination materialized
+LATTICE_MAX_CARDINALITY = 32
+# Bump when the file layout changes so old cube files are rebuilt
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CubeSpec:
+    """What to aggregate from one CSV file."""
+    name: str
+    path: str
+    dimensions: list
+    measures: list
+    # Name of the row-count measure
+    count: str = 'rows'
+    # Ratio measures computed after aggregation: {name: (numerator, denominator)}
+    ratios: dict = field(default_factory=dict)
+    # Extra cuboids to materialize besides the base cuboid and the lattice
+    cuboids: list = field(default_factory=list)
+
+    @property
+    def cube_path(self):
+        return os.path.splitext(self.path)[0] + '.cube.npz'
+
+
+# Known datasets: {name: CubeSpec}
+CUBES = {}
+
+
+def register_cube(name, path, dimensions, measures, **kwargs):
+    CUBES[name] = CubeSpec(name, path, dimensions, measures, **kwargs)
+    return CUBES[name]
+
+
+register_cube(
+    'superstore', os.path.join(REPO_ROOT, 'SuperStore Project', 'SampleSuperstore.csv'),
+    dimensions=['Region', 'State', 'City', 'Category', 'Sub-Category', 'Segment', 'Ship Mode'],
+    measures=['Sales', 'Quantity', 'Profit', 'Discount'],
+    count='order_lines',
+    ratios={'profit_margin': ('Profit', 'Sales'), 'average_discount': ('Discount', 'order_lines')},
+    cuboids=[['Region', 'State', 'City'], ['Region', 'State', 'Category', 'Sub-Category', 'Segment']],
+)
+register_cube(
+    'booking', os.path.join(REPO_ROOT, 'British_Airways', 'customer_booking.csv'),
+    dimensions=['route', 'booking_origin', 'sales_channel', 'trip_type', 'flight_day', 'flight_hour'],
+    measures=['num_passengers', 'booking_complete', 'wants_extra_baggage', 'wants_preferred_seat',
+              'wants_in_flight_meals', 'purchase_lead', 'length_of_stay', 'flight_duration'],
+    count='bookings',
+    ratios={'completion_rate': ('booking_complete', 'bookings'),
+            'average_passengers': ('num_passengers', 'bookings'),
+            'average_purchase_lead': ('purchase_lead', 'bookings'),
+            'average_length_of_stay': ('length_of_stay', 'bookings')},
+    cuboids=[['route', 'sales_channel', 'trip_type'], ['booking_origin', 'sales_channel', 'trip_type'],
+             ['route', 'booking_origin']],
+)
+
+
+def csv_version(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _code_dtype(categories):
+    return np.int8 if len(categories) < 2 ** 7 else np.int16 if len(categories) < 2 ** 15 else np.int32
+
+
+def _aggregate(cells, dimensions, measures):
+    # Cells (rows or a finer cuboid) summed up to ``dimensions``
+    if not dimensions:
+        return pd.DataFrame([cells[measures].sum()]).astype(cells[measures].dtypes.to_dict())
+    return cells.groupby(dimensions, sort=True)[measures].sum().reset_index()
+
+
+class Cube:
+    """Cuboids of one dataset, with dimension values stored as integer codes."""
+
+    def __init__(self, spec, categories, cuboids, version=None):
+        self.spec = spec
+        # {dimension: pd.Index of its values}; cuboid columns hold positions in it
+        self.categories = categories
+        # {tuple of dimensions in spec order: DataFrame of codes and summed measures}
+        self.cuboids = cuboids
+        self.version = version
+
+    @property
+    def measures(self):
+        return [self.spec.count] + self.spec.measures
+
+    @classmethod
+    def build(cls, spec, rows=None):
+        """Aggregate ``rows`` (by default the spec's CSV) into a cube."""
+        if rows is None:
+            rows = pd.read_csv(spec.path, usecols=spec.dimensions + spec.measures)
+        categories = {}
+        cells = pd.DataFrame({spec.count: np.ones(len(rows), dtype=np.int64)})
+        for dimension in spec.dimensions:
+            codes, uniques = pd.factorize(rows[dimension], sort=True)
+            categories[dimension] = pd.Index(uniques, name=dimension)
+            cells[dimension] = codes.astype(_code_dtype(uniques))
+        for measure in spec.measures:
+            cells[measure] = rows[measure].to_numpy()
+
+        measures = [spec.count] + spec.measures
+        base = _aggregate(cells, spec.dimensions, measures)
+        cuboids = {tuple(spec.dimensions): base}
+        lattice = [d for d in spec.dimensions if len(categories[d]) <= LATTICE_MAX_CARDINALITY]
+        wanted = [list(c) for size in range(len(lattice) + 1) for c in itertools.combinations(lattice, size)]
+        # Each cuboid is summed from the base cuboid, not from the rows
+        for dimensions in wanted + spec.cuboids:
+            key = tuple(d for d in spec.dimensions if d in dimensions)
+            if key not in cuboids:
+                cuboids[key] = _aggregate(base, list(key), measures)
+        return cls(spec, categories, cuboids)
+
+    def _plan(self, needed):
+        # Smallest cuboid holding every needed dimension
+        candidates = [key for key in self.cuboids if needed <= set(key)]
+        return min(candidates, key=lambda key: len(self.cuboids[key]))
+
+    def _codes(self, dimension, values):
+        # Values are matched as text, so 7 and '7' (from the command line)
+        # both select flight hour 7; unknown values select nothing
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        codes = self.categories[dimension].astype(str).get_indexer([str(v) for v in values])
+        return codes[codes >= 0]
+
+    def query(self, by=(), where=None, measures=None):
+        """Measures grouped by the ``by`` dimensions, for cells matching ``where``.
+
+        ``where`` maps dimensions to one value or a list of allowed values.
+        ``measures`` selects summed and ratio measures by name; all by default.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        where = where or {}
+        unknown = (set(by) | set(where)) - set(self.spec.dimensions)
+        if unknown:
+            raise KeyError(f'{self.spec.name} has no dimensions {sorted(unknown)}')
+
+        cells = self.cuboids[self._plan(set(by) | set(where))]
+        if where:
+            mask = np.ones(len(cells), dtype=bool)
+            for dimension, values in where.items():
+                mask &= np.isin(cells[dimension].to_numpy(), self._codes(dimension, values))
+            cells = cells[mask]
+
+        result = _aggregate(cells, by, self.measures)
+        for dimension in by:
+            result[dimension] = self.categories[dimension].take(result[dimension].to_numpy())
+        result = result.set_index(by) if by else result.rename(index={0: 'total'})
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name, (numerator, denominator) in self.spec.ratios.items():
+                result[name] = result[numerator] / result[denominator]
+        return result[measures] if measures else result
+
+    def save(self, path=None):
+        path = path or self.spec.cube_path
+        arrays = {}
+        for dimension, categories in self.categories.items():
+            values = categories.to_numpy()
+            # Text as fixed-width unicode: object arrays would need pickle to load
+            arrays[f'categories/{dimension}'] = values.astype(str) if values.dtype == object else values
+        keys = list(self.cuboids)
+        for i, key in enumerate(keys):
+            for column, values in self.cuboids[key].items():
+                arrays[f'{i}/{column}'] = values.to_numpy()
+        manifest = {'format': FORMAT_VERSION, 'name': self.spec.name, 'version': self.version,
+                    'cuboids': [list(key) for key in keys]}
+        arrays['manifest'] = np.array(json.dumps(manifest))
+        # Write to a temporary file first so a crash never leaves a torn cube
+        tmp_path = f'{path}.tmp.npz'
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, spec, path=None):
+        with np.load(path or spec.cube_path, allow_pickle=False) as arrays:
+            manifest = json.loads(str(arrays['manifest']))
+            if manifest['format'] != FORMAT_VERSION or manifest['name'] != spec.name:
+                return None
+            categories = {d: pd.Index(arrays[f'categories/{d}'], name=d) for d in spec.dimensions}
+            measures = [spec.count] + spec.measures
+            cuboids = {tuple(key): pd.DataFrame({column: arrays[f'{i}/{column}'] for column in key + measures})
+                       for i, key in enumerate(manifest['cuboids'])}
+        return cls(spec, categories, cuboids, manifest['version'])
+
+
+# Process-wide cache of loaded cubes: {name: Cube}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_cube(name, rebuild=False):
+    """Return the cube of dataset ``name``, building and saving it if its CSV changed."""
+    spec = CUBES[name]
+    version = csv_version(spec.path)
+    with _cache_lock:
+        cube = _cache.get(name)
+        if cube is None or cube.version != version or rebuild:
+            cube = None
+            if not rebuild and os.path.exists(spec.cube_path):
+                cube = Cube.load(spec)
+            if cube is None or cube.version != version:
+                cube = Cube.build(spec)
+                cube.version = version
+                cube.save()
+            _cache[name] = cube
+        return cube
+
+
+def _parse_where(items):
+    # "Region=East,West" -> {'Region': ['East', 'West']}
+    where = {}
+    for item in items:
+        dimension, _, values = item.partition('=')
+        where[dimension] = values.split(',')
+    return where
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query pre-aggregated cubes.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='(re)build cube files')
+    build.add_argument('names', nargs='*', help=f'datasets to build: {", ".join(CUBES)} (default: all)')
+    query = commands.add_parser('query', help='answer a query from a cube')
+    query.add_argument('name', choices=list(CUBES))
+    query.add_argument('--by', nargs='*', default=[], help='dimensions to group by')
+    query.add_argument('--where', action='append', default=[], metavar='DIM=V1,V2',
+                       help='keep only these values of a dimension (repeatable)')
+    query.add_argument('--measures', nargs='*', help='measures to show (default: all)')
+    query.add_argument('--sort', help='measure to sort by, descending')
+    query.add_argument('--top', type=int, help='rows shown')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        unknown = set(args.names) - set(CUBES)
+        if unknown:
+            parser.error(f'unknown datasets: {", ".join(sorted(unknown))}')
+        for name in args.names or list(CUBES):
+            cube = load_cube(name, rebuild=True)
+            cells = sum(len(cuboid) for cuboid in cube.cuboids.values())
+            print(f'{name}: {len(cube.cuboids)} cuboids, {cells} cells, '
+                  f'{os.path.getsize(cube.spec.cube_path) / 1024:.0f} KB')
+        return
+
+    result = load_cube(args.name).query(args.by, _parse_where(args.where), args.measures)
+    if args.sort:
+        result = result.sort_values(args.sort, ascending=False)
+    if args.top:
+        result = result.head(args.top)
+    print(result.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()